@@ -1,9 +1,9 @@
 import os
-import uuid
-import shutil
 from wtforms import FileField
 from sqladmin import Admin, ModelView
 from app.admin.auth import AdminAuth
+from app.core.media import media_url
+from app.media.storage import save_upload
 from app.db.base import engine
 from app.company.models import Company, CompanyTranslation
 from app.robots.models import Robot
@@ -51,6 +51,13 @@ def setup_admin(app):
             CompanyTranslation.banner,
         ]
 
+        # Same public URLs as the API serves
+        column_formatters = {
+            CompanyTranslation.logo: lambda model, attribute: media_url(model.logo),
+            CompanyTranslation.banner: lambda model, attribute: media_url(model.banner),
+        }
+        column_formatters_detail = column_formatters
+
         # Render logo & banner as <input type="file">
         form_overrides = {
             "logo": FileField,
@@ -62,22 +69,14 @@ def setup_admin(app):
             # Handle logo upload
             logo_file = data.get("logo")
             if logo_file and hasattr(logo_file, "file"):
-                filename = f"{uuid.uuid4()}_{logo_file.filename}"
-                filepath = os.path.join(UPLOAD_DIR, "logos", filename)
-                os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                with open(filepath, "wb") as buffer:
-                    shutil.copyfileobj(logo_file.file, buffer)
+                filepath = await save_upload(logo_file, os.path.join(UPLOAD_DIR, "logos"))
                 model.logo = filepath
                 data["logo"] = filepath
 
             # Handle banner upload
             banner_file = data.get("banner")
             if banner_file and hasattr(banner_file, "file"):
-                filename = f"{uuid.uuid4()}_{banner_file.filename}"
-                filepath = os.path.join(UPLOAD_DIR, "banners", filename)
-                os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                with open(filepath, "wb") as buffer:
-                    shutil.copyfileobj(banner_file.file, buffer)
+                filepath = await save_upload(banner_file, os.path.join(UPLOAD_DIR, "banners"))
                 model.banner = filepath
                 data["banner"] = filepath
 
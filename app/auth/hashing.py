@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.auth.utils import get_password_hash, verify_and_update_password
+
+
+class PasswordHasher:
+    """
+    Runs argon2 on its own small thread pool, away from the event loop and the shared threadpool.
+
+    argon2-cffi releases the GIL while hashing, so `workers` threads hash in
+    parallel. At most `max_pending` hashes run or wait at once; past that,
+    requests fail fast with 503 instead of queueing behind a login burst.
+    """
+
+    def __init__(self, workers: int = None, max_pending: int = None):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self.max_pending = max_pending or settings.PASSWORD_HASH_MAX_PENDING
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self._pending = 0  # only touched on the event loop
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, fn: Callable, *args):
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new hash when the stored one should be replaced)."""
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+
+password_hasher = PasswordHasher()
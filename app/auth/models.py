@@ -1,10 +1,15 @@
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
 from app.db.base import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Case-insensitive uniqueness; login and registration look users up by these expressions
+        Index("ux_users_email_lower", text("lower(email)"), unique=True),
+        Index("ux_users_username_lower", text("lower(username)"), unique=True),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -21,3 +26,20 @@ class User(Base):
 
     def __repr__(self) -> str:
         return f"<User id={self.id!r} email={self.email!r} username={self.username!r}>"
+
+
+class RefreshToken(Base):
+    """
+    An issued refresh token (by its `jti`). Tokens rotated from the same login
+    share a `family_id`: presenting one that was already used revokes the family.
+    Rows are kept until they expire, so a replay is recognised until then.
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(String(36), primary_key=True)
+    family_id = Column(String(36), nullable=False, index=True)
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import Optional
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import DateTime, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, invalidate_tags
+from app.core.config import settings
+from app.auth.models import User
+
+# Authenticated users by id, so a request with a valid token doesn't have to
+# read its user. Committed changes to a user drop its entry (deactivation,
+# password change, ...); entries also expire after AUTH_PRINCIPAL_CACHE_TTL_SECONDS.
+
+# The password hash never leaves the database: cached users have it unloaded
+_CACHED_COLUMNS = [column.key for column in User.__table__.columns if column.key != "hashed_password"]
+_DATETIME_COLUMNS = {column.key for column in User.__table__.columns if isinstance(column.type, DateTime)}
+
+
+def _create_backend():
+    if settings.RESPONSE_CACHE_URL:
+        import redis  # optional dependency, only needed for a shared cache
+
+        # Shared, so an invalidation reaches every worker
+        return RedisCacheBackend(redis.Redis.from_url(settings.RESPONSE_CACHE_URL), prefix="principal:")
+    return MemoryCacheBackend(settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Swap the cache backend (e.g. a RedisCacheBackend on a fake client)."""
+    global _backend
+    _backend = backend
+
+
+def is_enabled() -> bool:
+    return settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS > 0
+
+
+def _tag(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def _dump(user: User) -> bytes:
+    return orjson.dumps({key: getattr(user, key) for key in _CACHED_COLUMNS})
+
+
+def _load(data: bytes) -> User:
+    values = orjson.loads(data)
+    for key in _DATETIME_COLUMNS:
+        if values.get(key) is not None:
+            values[key] = datetime.fromisoformat(values[key])
+    user = User(**values)
+    # A clean, detached row: merge(load=False) can attach it without a query
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """The user with `user_id` in `db`'s session, read from the cache when possible."""
+    if not is_enabled():
+        return await db.get(User, user_id)
+
+    backend = get_backend()
+    data = await run_in_threadpool(backend.get, user_id) if backend.blocking else backend.get(user_id)
+    if data is not None:
+        return await db.merge(_load(data), load=False)
+
+    user = await db.get(User, user_id)
+    if user is not None:
+        args = (user_id, _dump(user), [_tag(user_id)], settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+        if backend.blocking:
+            await run_in_threadpool(backend.set, *args)
+        else:
+            backend.set(*args)
+    return user
+
+
+def invalidate_user(*user_ids: str) -> None:
+    if user_ids:
+        invalidate_tags(get_backend(), [_tag(user_id) for user_id in user_ids])
+
+
+# --- Invalidation: collect changed users at flush, drop them once committed ---
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("principal_cache_users", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    changed = session.info.pop("principal_cache_users", None)
+    if changed:
+        invalidate_user(*changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_users(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("principal_cache_users", None)
@@ -0,0 +1,249 @@
+"""
+Server-side refresh token state: rotation, reuse detection, revocation.
+
+Every refresh token's `jti` is recorded at issue. Refreshing marks it used
+and records its successor in the same family; presenting a used token again
+means it was stolen (or replayed), so its whole family is revoked. Tokens
+issued before the store existed carry no `jti`: they are recorded, as used,
+under `legacy_jti` on their first refresh. Expired rows are deleted in small
+batches by `run_sweeper`.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.auth.models import RefreshToken
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenRejected(Exception):
+    """Unknown, expired, revoked or already used refresh token."""
+
+
+class RefreshTokenReused(RefreshTokenRejected):
+    """An already used refresh token was presented again; its family is now revoked."""
+
+
+# uuid5 ids (a SHA-1 of the token) can't collide with the uuid4 jtis of issued tokens
+_LEGACY_NAMESPACE = uuid.UUID("5b0f3c52-8a3e-4c1d-9e27-6d4a1f8b2c90")
+
+
+def legacy_jti(token: str) -> str:
+    """The id a refresh token without a `jti` claim is recorded under."""
+    return str(uuid.uuid5(_LEGACY_NAMESPACE, token))
+
+
+class DatabaseRefreshTokenStore:
+    """Refresh tokens in the refresh_tokens table; every call is one short transaction."""
+
+    def __init__(self, sessionmaker):
+        self.sessionmaker = sessionmaker
+
+    async def add(self, jti: str, family_id: str, user_id: str, expires_at: datetime) -> None:
+        async with self.sessionmaker() as db, db.begin():
+            db.add(RefreshToken(jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at))
+
+    async def rotate(self, jti: str, new_jti: str, expires_at: datetime) -> str:
+        """Use `jti` and record `new_jti` in its family; returns the user id."""
+        now = datetime.utcnow()
+        reused = False
+        async with self.sessionmaker() as db, db.begin():
+            # Conditional update: of two concurrent refreshes with one token, only one wins
+            row = (await db.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.jti == jti,
+                    RefreshToken.used_at.is_(None),
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > now,
+                )
+                .values(used_at=now)
+                .returning(RefreshToken.user_id, RefreshToken.family_id)
+                .execution_options(synchronize_session=False)
+            )).first()
+            if row is not None:
+                db.add(RefreshToken(jti=new_jti, family_id=row.family_id, user_id=row.user_id, expires_at=expires_at))
+            else:
+                family_id = await db.scalar(
+                    select(RefreshToken.family_id).where(
+                        RefreshToken.jti == jti, RefreshToken.used_at.is_not(None), RefreshToken.revoked_at.is_(None)
+                    )
+                )
+                if family_id is not None:
+                    reused = True
+                    await db.execute(self._revoke(RefreshToken.family_id == family_id, now))
+        if reused:
+            raise RefreshTokenReused(jti)
+        if row is None:
+            raise RefreshTokenRejected(jti)
+        return row.user_id
+
+    async def rotate_legacy(self, jti: str, new_jti: str, user_id: str, expires_at: datetime) -> str:
+        """
+        `rotate` for a token issued without a jti (`jti` is its `legacy_jti`).
+
+        Its first refresh records it as used, starting a family with `new_jti`;
+        it was issued before now, so it expires before `expires_at` and the row
+        outlives it. Any later presentation goes through reuse detection.
+        """
+        now = datetime.utcnow()
+        family_id = str(uuid.uuid4())
+        async with self.sessionmaker() as db, db.begin():
+            # The primary key decides between concurrent first refreshes
+            recorded = await db.scalar(
+                insert(RefreshToken)
+                .values(jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at, used_at=now)
+                .on_conflict_do_nothing()
+                .returning(RefreshToken.jti)
+            )
+            if recorded is not None:
+                db.add(RefreshToken(jti=new_jti, family_id=family_id, user_id=user_id, expires_at=expires_at))
+        if recorded is None:
+            return await self.rotate(jti, new_jti, expires_at)
+        return user_id
+
+    async def revoke(self, jti: str, user_id: str) -> None:
+        """Revoke the family of `user_id`'s token `jti` (one session, e.g. on logout)."""
+        family = select(RefreshToken.family_id).where(RefreshToken.jti == jti, RefreshToken.user_id == user_id)
+        async with self.sessionmaker() as db, db.begin():
+            await db.execute(self._revoke(RefreshToken.family_id == family.scalar_subquery(), datetime.utcnow()))
+
+    async def revoke_user(self, user_id: str) -> None:
+        """Revoke every session of a user."""
+        async with self.sessionmaker() as db, db.begin():
+            await db.execute(self._revoke(RefreshToken.user_id == user_id, datetime.utcnow()))
+
+    @staticmethod
+    def _revoke(condition, now: datetime):
+        return (
+            update(RefreshToken)
+            .where(condition, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def sweep(self, before: datetime, batch_size: int) -> int:
+        """Delete up to `batch_size` tokens that expired before `before`; returns how many."""
+        # SKIP LOCKED: concurrent sweepers (one per worker) take different rows instead of waiting
+        batch = (
+            select(RefreshToken.jti)
+            .where(RefreshToken.expires_at < before)
+            .order_by(RefreshToken.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.sessionmaker() as db, db.begin():
+            result = await db.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.jti.in_(batch.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+        return result.rowcount
+
+
+class MemoryRefreshTokenStore:
+    """Per-process store, for tests and single-process development."""
+
+    def __init__(self):
+        self._tokens: Dict[str, dict] = {}
+
+    async def add(self, jti: str, family_id: str, user_id: str, expires_at: datetime) -> None:
+        self._tokens[jti] = {
+            "family_id": family_id, "user_id": user_id, "expires_at": expires_at, "used_at": None, "revoked_at": None,
+        }
+
+    async def rotate(self, jti: str, new_jti: str, expires_at: datetime) -> str:
+        now = datetime.utcnow()
+        token = self._tokens.get(jti)
+        if token is None or token["revoked_at"] is not None or token["expires_at"] <= now:
+            raise RefreshTokenRejected(jti)
+        if token["used_at"] is not None:
+            self._revoke_where(lambda other: other["family_id"] == token["family_id"], now)
+            raise RefreshTokenReused(jti)
+        token["used_at"] = now
+        await self.add(new_jti, token["family_id"], token["user_id"], expires_at)
+        return token["user_id"]
+
+    async def rotate_legacy(self, jti: str, new_jti: str, user_id: str, expires_at: datetime) -> str:
+        if jti in self._tokens:
+            return await self.rotate(jti, new_jti, expires_at)
+        family_id = str(uuid.uuid4())
+        await self.add(jti, family_id, user_id, expires_at)
+        self._tokens[jti]["used_at"] = datetime.utcnow()
+        await self.add(new_jti, family_id, user_id, expires_at)
+        return user_id
+
+    async def revoke(self, jti: str, user_id: str) -> None:
+        token = self._tokens.get(jti)
+        if token is not None and token["user_id"] == user_id:
+            self._revoke_where(lambda other: other["family_id"] == token["family_id"], datetime.utcnow())
+
+    async def revoke_user(self, user_id: str) -> None:
+        self._revoke_where(lambda other: other["user_id"] == user_id, datetime.utcnow())
+
+    def _revoke_where(self, predicate, now: datetime) -> None:
+        for token in self._tokens.values():
+            if token["revoked_at"] is None and predicate(token):
+                token["revoked_at"] = now
+
+    async def sweep(self, before: datetime, batch_size: int) -> int:
+        expired = [jti for jti, token in self._tokens.items() if token["expires_at"] < before][:batch_size]
+        for jti in expired:
+            del self._tokens[jti]
+        return len(expired)
+
+
+def _create_store():
+    if settings.AUTH_REFRESH_TOKEN_STORE == "memory":
+        return MemoryRefreshTokenStore()
+    return DatabaseRefreshTokenStore(AsyncSessionLocal)
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = _create_store()
+    return _store
+
+
+def set_store(store) -> None:
+    """Swap the store (e.g. a MemoryRefreshTokenStore in tests)."""
+    global _store
+    _store = store
+
+
+async def sweep_expired(store=None, batch_size: Optional[int] = None) -> int:
+    """Delete every expired token, one short transaction per batch; returns how many."""
+    store = store or get_store()
+    batch_size = batch_size or settings.AUTH_REFRESH_SWEEP_BATCH_SIZE
+    before = datetime.utcnow()
+    total = 0
+    while True:
+        deleted = await store.sweep(before, batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+        # Let request handlers in between batches
+        await asyncio.sleep(0)
+
+
+async def run_sweeper() -> None:
+    while True:
+        try:
+            deleted = await sweep_expired()
+            if deleted:
+                logger.info("Deleted %d expired refresh tokens", deleted)
+        except Exception:
+            logger.exception("Refresh token sweep failed")
+        await asyncio.sleep(settings.AUTH_REFRESH_SWEEP_INTERVAL_SECONDS)
@@ -1,25 +1,30 @@
 import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.auth.hashing import password_hasher
 from app.auth.models import User
+from app.auth.refresh_tokens import RefreshTokenRejected, get_store, legacy_jti
 from app.auth.schemas import (
     UserRegister,
     UserLogin,
     UserResponse,
+    TokenData,
     TokenResponse,
     TokenRefresh
 )
 from app.auth.utils import (
-    get_password_hash,
-    verify_password,
+    access_token_claims,
     create_access_token,
     create_refresh_token,
     verify_token,
     get_current_active_user,
+    get_current_principal,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS
 )
@@ -28,54 +33,51 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
-    
-    # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
+    # argon2 is CPU-bound, it runs on the hashing pool (before the INSERT: no connection held meanwhile)
+    hashed_password = await password_hasher.hash(user_data.password)
+
+    # One statement: the unique indexes, not pre-checks, decide (concurrent sign-ups can't both win)
+    user = await db.scalar(
+        insert(User)
+        .values(
+            id=str(uuid.uuid4()),
+            email=user_data.email,
+            username=user_data.username,
+            hashed_password=hashed_password,
+            full_name=user_data.full_name,
+            is_active=True,
+            is_verified=False,
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+    if user is None:
+        # Conflict: tell which of the keys is taken
+        email_taken = await db.scalar(
+            select(User.id).where(func.lower(User.email) == user_data.email.lower())
         )
-    
-    # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
-    if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
+            detail="Email already registered" if email_taken else "Username already taken"
         )
-    
-    # Create new user
-    user = User(
-        id=str(uuid.uuid4()),
-        email=user_data.email,
-        username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
-        full_name=user_data.full_name,
-        is_active=True,
-        is_verified=False
-    )
-    
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     
     return user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login and get access and refresh tokens."""
     
-    # Find user by username or email
-    user = db.query(User).filter(
-        or_(
-            User.username == login_data.username,
-            User.email == login_data.username
-        )
-    ).first()
+    # Find user by email or username (usernames can't contain "@"), each a single index lookup
+    identifier = login_data.username.lower()
+    column = User.email if "@" in identifier else User.username
+    user = await db.scalar(select(User).where(func.lower(column) == identifier))
+    if user is None and "@" in identifier:
+        # Usernames with "@" registered before it was disallowed
+        user = await db.scalar(select(User).where(func.lower(User.username) == identifier))
     
     if not user:
         raise HTTPException(
@@ -84,7 +86,10 @@ def login(login_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(login_data.password, user.hashed_password):
+    # End the read transaction so the pooled connection isn't held while hashing
+    await db.commit()
+    valid, new_hash = await password_hasher.verify(login_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -97,22 +102,27 @@ def login(login_data: UserLogin, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
     
-    # Update last login
+    # Update last login, and the hash when the argon2 parameters have changed since it was made
     user.last_login = datetime.utcnow()
-    db.commit()
+    if new_hash:
+        user.hashed_password = new_hash
+    await db.commit()
     
     # Create tokens
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id, "username": user.username},
+        data=access_token_claims(user),
         expires_delta=access_token_expires
     )
     
+    # A new session: the first token of a new family
+    jti = str(uuid.uuid4())
     refresh_token_expires = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     refresh_token = create_refresh_token(
-        data={"sub": user.id, "username": user.username},
+        data={"sub": user.id, "username": user.username, "jti": jti},
         expires_delta=refresh_token_expires
     )
+    await get_store().add(jti, str(uuid.uuid4()), user.id, datetime.utcnow() + refresh_token_expires)
     
     return TokenResponse(
         access_token=access_token,
@@ -123,14 +133,14 @@ def login(login_data: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(token_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token."""
     
     # Verify refresh token
     token_payload = verify_token(token_data.refresh_token, token_type="refresh")
     
-    # Get user
-    user = db.query(User).filter(User.id == token_payload.user_id).first()
+    # Get user (a fresh read: new tokens carry its current account state)
+    user = await db.get(User, token_payload.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -146,13 +156,28 @@ def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
     # Create new tokens
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id, "username": user.username},
+        data=access_token_claims(user),
         expires_delta=access_token_expires
     )
     
+    # Rotate: the presented token is used up; presenting it again revokes the session
+    new_jti = str(uuid.uuid4())
     refresh_token_expires = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    expires_at = datetime.utcnow() + refresh_token_expires
+    try:
+        if token_payload.jti:
+            await get_store().rotate(token_payload.jti, new_jti, expires_at)
+        else:
+            # Issued before the store existed: recorded as used now, so it can't be replayed
+            await get_store().rotate_legacy(legacy_jti(token_data.refresh_token), new_jti, user.id, expires_at)
+    except RefreshTokenRejected:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     new_refresh_token = create_refresh_token(
-        data={"sub": user.id, "username": user.username},
+        data={"sub": user.id, "username": user.username, "jti": new_jti},
         expires_delta=refresh_token_expires
     )
     
@@ -171,6 +196,18 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(current_user: User = Depends(get_current_active_user)):
-    """Logout user (client should discard tokens)."""
+async def logout(
+    token_data: Optional[TokenRefresh] = None,
+    principal: TokenData = Depends(get_current_principal)
+):
+    """
+    Logout: revoke the session of the given refresh token, or every session
+    of the user without one. Access tokens stay valid until they expire.
+    """
+    if token_data is None:
+        await get_store().revoke_user(principal.user_id)
+    else:
+        token_payload = verify_token(token_data.refresh_token, token_type="refresh")
+        jti = token_payload.jti or legacy_jti(token_data.refresh_token)
+        await get_store().revoke(jti, principal.user_id)
     return {"message": "Successfully logged out"}
@@ -5,7 +5,8 @@ from datetime import datetime
 
 class UserRegister(BaseModel):
     email: EmailStr
-    username: str = Field(..., min_length=3, max_length=100)
+    # No "@": login tells emails from usernames by it
+    username: str = Field(..., min_length=3, max_length=100, pattern=r"^[^@]+$")
     password: str = Field(..., min_length=8, max_length=70)
     full_name: Optional[str] = Field(None, max_length=255)
 
@@ -43,3 +44,8 @@ class TokenRefresh(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[str] = None
     username: Optional[str] = None
+    # Signed account state claims (access tokens issued with access_token_claims)
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    # Refresh tokens: the id the refresh token store knows them by
+    jti: Optional[str] = None
@@ -0,0 +1,133 @@
+"""
+JWT signing and verification with key rotation and a verified-token cache.
+
+Tokens are signed with the active key and carry its id in the `kid` header;
+every configured key still verifies the tokens it signed. To rotate, add a
+new key, make it active, and drop the old one once its tokens have expired
+(REFRESH_TOKEN_EXPIRE_DAYS). Nobody has to log in again.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from app.core.config import settings
+
+
+class InvalidTokenError(Exception):
+    """Bad signature, unknown key, malformed or expired token."""
+
+
+class JoseBackend:
+    """python-jose (the default)."""
+
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self.errors = (JWTError,)
+
+    def encode(self, claims: dict, key: str, algorithm: str, kid: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm, headers={"kid": kid})
+
+    def header(self, token: str) -> dict:
+        return self._jwt.get_unverified_header(token)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        return self._jwt.decode(token, key, algorithms=[algorithm])
+
+
+class PyJWTBackend:
+    """PyJWT: same tokens; benchmark both with your versions before switching."""
+
+    def __init__(self):
+        import jwt  # optional dependency, only needed with JWT_BACKEND=pyjwt
+
+        self._jwt = jwt
+        self.errors = (jwt.PyJWTError,)
+
+    def encode(self, claims: dict, key: str, algorithm: str, kid: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm, headers={"kid": kid})
+
+    def header(self, token: str) -> dict:
+        return self._jwt.get_unverified_header(token)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        return self._jwt.decode(token, key, algorithms=[algorithm])
+
+
+BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+
+
+class TokenCodec:
+    """
+    Signs and verifies tokens; remembers up to `cache_size` verified tokens.
+
+    A cached token skips the signature check until its own `exp`, so
+    repeated requests with the same bearer token verify in a dict lookup.
+    """
+
+    def __init__(self, keys: Dict[str, str], active_kid: str, algorithm: str, backend, cache_size: int):
+        if active_kid not in keys:
+            raise ValueError(f"Active JWT key {active_kid!r} is not configured")
+        self.keys = keys
+        self.active_kid = active_kid
+        self.algorithm = algorithm
+        self.backend = backend
+        self.cache_size = cache_size
+        self._verified: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, claims: dict) -> str:
+        return self.backend.encode(claims, self.keys[self.active_kid], self.algorithm, self.active_kid)
+
+    def decode(self, token: str) -> dict:
+        """Verified claims of `token` (shared, don't mutate); raises InvalidTokenError."""
+        with self._lock:
+            cached = self._verified.get(token)
+            if cached is not None:
+                if cached[0] > time.time():
+                    self._verified.move_to_end(token)
+                    return cached[1]
+                del self._verified[token]
+                raise InvalidTokenError("Token expired")
+
+        try:
+            # Tokens issued before key ids were introduced have none
+            kid = self.backend.header(token).get("kid") or ("default" if "default" in self.keys else self.active_kid)
+            key = self.keys.get(kid)
+            if key is None:
+                raise InvalidTokenError(f"Unknown key id {kid!r}")
+            claims = self.backend.decode(token, key, self.algorithm)
+        except self.backend.errors as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+        expires = claims.get("exp")
+        if self.cache_size > 0 and isinstance(expires, (int, float)):
+            with self._lock:
+                self._verified[token] = (float(expires), claims)
+                if len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        with self._lock:
+            self._verified.clear()
+
+
+def _configured_keys() -> Dict[str, str]:
+    return settings.JWT_SIGNING_KEYS or {"default": settings.SECRET_KEY}
+
+
+def create_codec() -> TokenCodec:
+    keys = _configured_keys()
+    return TokenCodec(
+        keys,
+        settings.JWT_ACTIVE_KID or next(iter(keys)),
+        settings.JWT_ALGORITHM,
+        BACKENDS[settings.JWT_BACKEND](),
+        settings.JWT_VERIFY_CACHE_SIZE,
+    )
+
+
+codec = create_codec()
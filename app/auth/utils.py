@@ -1,24 +1,33 @@
-import os
 import hashlib
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from passlib.context import CryptContext
-from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.database import get_async_db
 from app.auth.models import User
+from app.auth.principals import get_user
 from app.auth.schemas import TokenData
+from app.auth.tokens import InvalidTokenError, codec
 
 # Configuration
-SECRET_KEY = os.getenv("SECRET_KEY", "56a6ed075d2141d2cd0bb240eebb92f0b12c5297df034ff498a8d1a342c70679")
-ALGORITHM = "HS256"
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# min_rounds: hashes with a lower time cost need an update (memory cost is compared exactly)
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__min_rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 def _prehash(password: str) -> str:
@@ -31,12 +40,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(_prehash(plain_password), hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also returns a new hash when the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(_prehash(plain_password), hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash password with SHA-256 + bcrypt."""
     prehashed = _prehash(password)
     return pwd_context.hash(prehashed)
 
 
+def access_token_claims(user: User) -> dict:
+    """Claims of a user's access token: identity plus signed account state."""
+    return {"sub": user.id, "username": user.username, "active": user.is_active, "verified": user.is_verified}
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -46,8 +65,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return codec.encode(to_encode)
 
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -59,41 +77,45 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
         expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return codec.encode(to_encode)
 
 
-def verify_token(token: str, token_type: str = "access") -> TokenData:
-    """Verify a JWT token and return token data."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def verify_token(token: str, token_type: str = "access") -> TokenData:
+    """Verify a JWT token and return token data."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        username: str = payload.get("username")
-        token_type_from_payload: str = payload.get("type")
-        
-        if user_id is None or token_type_from_payload != token_type:
-            raise credentials_exception
-        
-        token_data = TokenData(user_id=user_id, username=username)
-        return token_data
-    except JWTError:
-        raise credentials_exception
+        payload = codec.decode(token)
+    except InvalidTokenError:
+        raise _credentials_exception()
+
+    user_id: str = payload.get("sub")
+    if user_id is None or payload.get("type") != token_type:
+        raise _credentials_exception()
+
+    return TokenData(
+        user_id=user_id,
+        username=payload.get("username"),
+        is_active=payload.get("active"),
+        is_verified=payload.get("verified"),
+        jti=payload.get("jti"),
+    )
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
-    """Get the current authenticated user."""
+    """Get the current authenticated user (from the principal cache when possible)."""
     token_data = verify_token(token, token_type="access")
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await get_user(db, token_data.user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -119,4 +141,35 @@ async def get_current_active_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> TokenData:
+    """
+    Identity and account state of the caller, for routes that don't need the User row.
+
+    With AUTH_TRUST_TOKEN_CLAIMS, tokens carrying account state claims are
+    trusted as is (no lookup); otherwise the state comes from the user cache.
+    """
+    token_data = verify_token(token, token_type="access")
+    if not (settings.AUTH_TRUST_TOKEN_CLAIMS and token_data.is_active is not None):
+        user = await get_user(db, token_data.user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        token_data.username, token_data.is_active, token_data.is_verified = (
+            user.username, user.is_active, user.is_verified
+        )
+
+    if not token_data.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    return token_data
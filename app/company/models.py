@@ -2,10 +2,14 @@ import re
 import enum
 from datetime import datetime
 import uuid
+from typing import Dict, List, Optional, Sequence, Set
 from sqlalchemy import (
-    Column, String, Text, Boolean, DateTime, Enum, JSON, event, ForeignKey
+    Column, String, Text, Boolean, DateTime, Enum, JSON, event, ForeignKey, Index, Computed, UniqueConstraint,
+    inspect, or_, select,
 )
-from sqlalchemy.orm import validates, relationship
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import validates, relationship, deferred
 from app.db.base import Base
 
 
@@ -18,6 +22,98 @@ def slugify(name: str) -> str:
     return slug.strip('-')
 
 
+def _slug_base(name: str) -> str:
+    # Room left under String(255) for a numeric suffix
+    return slugify(name)[:240].strip('-') or uuid.uuid4().hex[:8]
+
+
+def _max_suffixes(slugs) -> Dict[str, int]:
+    """Highest numeric suffix per base among `slugs` (`base-N`; a bare base counts as 0)."""
+    highest: Dict[str, int] = {}
+    for slug in slugs:
+        highest.setdefault(slug, 0)
+        base, _, suffix = slug.rpartition("-")
+        if base and suffix.isdigit():
+            highest[base] = max(highest.get(base, 0), int(suffix))
+    return highest
+
+
+def _taken_slugs_query(model_class, bases: Sequence[str], exclude_slug: Optional[str] = None):
+    """Existing `base` and `base-...` slugs of `model_class`."""
+    column = model_class.slug
+    # Slugs are [a-z0-9-] only, nothing to escape in the LIKE patterns
+    stmt = select(column).where(or_(column.in_(bases), *(column.like(f"{base}-%") for base in bases)))
+    return stmt.where(column != exclude_slug) if exclude_slug else stmt
+
+
+def _assign_slugs(bases: Sequence[str], taken: Set[str]) -> List[str]:
+    """`base` when free, else `base-N` past the highest taken N; repeated bases get distinct slugs."""
+    highest = _max_suffixes(taken)
+    slugs = []
+    for base in bases:
+        slug = base
+        if slug in taken:
+            suffix = highest[base] + 1
+            # A suffixed slug may also be some other name's bare base
+            while f"{base}-{suffix}" in taken:
+                suffix += 1
+            slug = f"{base}-{suffix}"
+            highest[base] = suffix
+        taken.add(slug)
+        highest.setdefault(slug, 0)
+        slugs.append(slug)
+    return slugs
+
+
+async def generate_unique_slugs(
+    db, names: Sequence[str], model_class, exclude_slug: Optional[str] = None
+) -> List[str]:
+    """
+    Unique slugs for many names (same order), resolved in one query.
+
+    Reads every existing `base` / `base-N` slug of the batch at once, then
+    hands out suffixes in memory, so names repeated within the batch get
+    distinct slugs too. Not reserved: inserts must still handle a conflict
+    with a concurrent writer (see add_with_unique_slug).
+    """
+    bases = [_slug_base(name) for name in names]
+    if not bases:
+        return []
+    taken = set(await db.scalars(_taken_slugs_query(model_class, sorted(set(bases)), exclude_slug)))
+    return _assign_slugs(bases, taken)
+
+
+async def generate_unique_slug(db, name: str, model_class, exclude_slug: Optional[str] = None) -> str:
+    """Unique slug for `name` in one query; `exclude_slug` (the row's current slug) counts as free."""
+    (slug,) = await generate_unique_slugs(db, [name], model_class, exclude_slug)
+    return slug
+
+
+async def add_with_unique_slug(db, obj, name: str, exclude_slug: Optional[str] = None, attempts: int = 3) -> str:
+    """
+    Give `obj` a unique slug for `name` and flush it (adding it to the session).
+
+    The slug is flushed in a SAVEPOINT: when a concurrent writer commits the
+    same slug first, only the savepoint is rolled back and a fresh slug is
+    tried. Other pending changes are flushed beforehand so they survive a retry.
+    """
+    if inspect(obj).persistent:
+        await db.flush()
+    failed = error = None
+    for _ in range(attempts):
+        slug = await generate_unique_slug(db, name, type(obj), exclude_slug)
+        if slug == failed:
+            break  # still free: the violation wasn't on the slug
+        try:
+            async with db.begin_nested():
+                obj.slug = slug
+                db.add(obj)
+            return slug
+        except IntegrityError as exc:
+            failed, error = slug, exc
+    raise error
+
+
 # --- Enums ---
 class CompanyType(enum.Enum):
     MANUFACTURER = "manufacturer"
@@ -49,9 +145,34 @@ class LanguageEnum(enum.Enum):
     IT_CH = "it-CH"
 
 
+# Postgres text search configuration per translation language
+TEXT_SEARCH_CONFIGS = {
+    LanguageEnum.EN: "english",
+    LanguageEnum.DE_CH: "german",
+    LanguageEnum.FR_CH: "french",
+    LanguageEnum.IT_CH: "italian",
+}
+
+# The enum column stores member names, compared against constants so the expression stays immutable
+_TRANSLATION_SEARCH_CONFIG = "CASE language {} ELSE 'simple'::regconfig END".format(
+    " ".join(f"WHEN '{language.name}' THEN '{config}'::regconfig" for language, config in TEXT_SEARCH_CONFIGS.items())
+)
+TRANSLATION_SEARCH_VECTOR = (
+    f"setweight(to_tsvector({_TRANSLATION_SEARCH_CONFIG}, coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector({_TRANSLATION_SEARCH_CONFIG}, coalesce(city, '')), 'B') || "
+    f"setweight(to_tsvector({_TRANSLATION_SEARCH_CONFIG}, coalesce(description, '')), 'C')"
+)
+
+
 # --- Main Company ---
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        # Keyset pagination over active companies seeks on (defult_name, slug)
+        Index("ix_companies_active_name_slug", "is_active", "defult_name", "slug"),
+        # Prefix (LIKE 'base-%') lookups of unique slug generation
+        Index("ix_companies_slug_pattern", "slug", postgresql_ops={"slug": "text_pattern_ops"}),
+    )
 
     slug = Column(String(255), primary_key=True, index=True)
     defult_name = Column(String(255), nullable=False)
@@ -75,9 +196,18 @@ class Company(Base):
     def __repr__(self) -> str:
         return f"<Company slug={self.slug!r} type={self.type.value!r}>"
 
+    def cache_tags(self):
+        """Response cache entries to drop when this row changes."""
+        return ["companies", f"company:{self.slug}"]
+
 
 class CompanyTranslation(Base):
     __tablename__ = "company_translations"
+    __table_args__ = (
+        # One translation per language; its index serves lookups by (company_slug, language)
+        UniqueConstraint("company_slug", "language", name="uq_company_translations_company_language"),
+        Index("ix_company_translations_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     company_slug = Column(String(255), ForeignKey("companies.slug"), nullable=False)
@@ -94,14 +224,28 @@ class CompanyTranslation(Base):
     state = Column(String(100), nullable=True)
     country = Column(String(100), nullable=True)
     postal_code = Column(String(20), nullable=True)
+    # {variant: path} of the WebP renditions of local logo/banner files (app.media.derivatives)
+    logo_variants = Column(JSON(none_as_null=True), nullable=True)
+    banner_variants = Column(JSON(none_as_null=True), nullable=True)
     company = relationship("Company", back_populates="translations")
 
+    # Full-text search document, maintained by Postgres
+    search_vector = deferred(Column(TSVECTOR, Computed(TRANSLATION_SEARCH_VECTOR, persisted=True)))
+
+    def cache_tags(self):
+        return ["companies", f"company:{self.company_slug}"]
+
+    def touched_parent(self, session):
+        """Row whose updated_at moves when this one changes."""
+        return self.company if self.company_slug is None else session.get(Company, self.company_slug)
+
 
 # --- Auto-generate slug on insert/update ---
 @event.listens_for(Company, "before_insert")
 def before_insert(mapper, connection, target):
     if not target.slug and target.defult_name:
-        target.slug = slugify(target.defult_name)
+        base = _slug_base(target.defult_name)
+        (target.slug,) = _assign_slugs([base], set(connection.scalars(_taken_slugs_query(Company, [base]))))
 
 
 @event.listens_for(Company, "before_update")
@@ -1,20 +1,26 @@
-import os
-import shutil
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.auth.utils import get_current_principal
+from app.db.database import get_async_db
+from app.core.loading import loader_options
+from app.media.storage import UploadLimitRoute, presign_upload, save_upload
 from app.company.models import Company, generate_unique_slug
 from app.company.schemas import CompanyUpdate, CompanyResponse
 
 UPLOAD_DIR = "uploads/logos"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-router = APIRouter(prefix="/companies", tags=["private-companies"])
+router = APIRouter(
+    prefix="/companies",
+    tags=["private-companies"],
+    dependencies=[Depends(get_current_principal)],
+    route_class=UploadLimitRoute,
+)
 
 @router.put("/{company_slug}", response_model=CompanyResponse)
-def update_company(company_slug: str, company: CompanyUpdate, db: Session = Depends(get_db)):
-    db_company = db.query(Company).get(company_slug)
+async def update_company(company_slug: str, company: CompanyUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_company = await db.get(Company, company_slug)
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
 
@@ -23,38 +29,54 @@ def update_company(company_slug: str, company: CompanyUpdate, db: Session = Depe
 
     # If name is updated, regenerate slug
     if "name" in company.model_dump(exclude_unset=True):
-        db_company.slug = generate_unique_slug(db, db_company.name, Company, exclude_slug=company_slug)
+        db_company.slug = await generate_unique_slug(db, db_company.name, Company, exclude_slug=company_slug)
 
-    db.commit()
-    db.refresh(db_company)
-    return db_company
+    await db.commit()
+    # Reload with relationships eagerly: lazy loads can't run under asyncio
+    return await db.scalar(
+        select(Company)
+        .options(*loader_options(CompanyResponse, Company))
+        .where(Company.slug == db_company.slug)
+        .execution_options(populate_existing=True)
+    )
 
 
 @router.put("/{company_slug}/upload-logo")
-async def upload_logo(company_slug: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_logo(company_slug: str, file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
     # Check if company exists
-    db_company = db.query(Company).get(company_slug)
+    db_company = await db.get(Company, company_slug)
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
     
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
 
-    file_ext = os.path.splitext(file.filename)[1]
-    file_path = os.path.join(UPLOAD_DIR, f"company_{company_slug}{file_ext}")
+    file_path = await save_upload(file, UPLOAD_DIR)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
     return {"message": "Logo uploaded successfully", "logo_url": file_path}
 
 
+@router.post("/{company_slug}/logo-upload-url")
+async def logo_upload_url(
+    company_slug: str, filename: str, content_type: str, db: AsyncSession = Depends(get_async_db)
+):
+    """Presigned URL to upload a logo straight to storage; the returned `path` is then set as the logo."""
+    db_company = await db.get(Company, company_slug)
+    if not db_company:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    if not content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
+
+    return await presign_upload(UPLOAD_DIR, filename, content_type)
+
+
 @router.delete("/{company_slug}", status_code=204)
-def delete_company(company_slug: str, db: Session = Depends(get_db)):
-    db_company = db.query(Company).get(company_slug)
+async def delete_company(company_slug: str, db: AsyncSession = Depends(get_async_db)):
+    db_company = await db.get(Company, company_slug)
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    db.delete(db_company)
-    db.commit()
-    return None
\ No newline at end of file
+    await db.delete(db_company)
+    await db.commit()
+    return None
@@ -1,51 +1,230 @@
-from math import ceil
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.db.database import get_db
-from app.company.models import Company, CompanyTranslation
+from app.db.database import from_replica, get_read_db
+from app.core.cache import cache_key, cache_response, cached_response
+from app.core.conditional import not_modified, set_validators, validators
+from app.core.serialization import json_response
+from app.core.counts import CountStrategy, count_rows, page_count
+from app.core.pagination import keyset_paginate
+from app.company.models import Company, CompanyTranslation, LanguageEnum as ModelLanguageEnum
+from app.search import backend as search
+from app.search import postgres as pg_search
 from app.company.schemas import (
-    CompanyResponse,
+    LocalizedCompanyResponse,
     PaginatedCompanyResponse,
+    CursorPaginatedCompanyResponse,
+    LanguageEnum,
 )
 
 router = APIRouter(prefix="/companies", tags=["public-companies"])
 
+# Sort key for listings: (sort column, unique tiebreaker), backed by ix_companies_active_name_slug
+COMPANY_SORT_KEY = (Company.defult_name, Company.slug)
+
+# Served when the requested language has no translation, and when nothing matches Accept-Language
+DEFAULT_LANGUAGE = LanguageEnum.EN
+COMPANY_FIELDS = ("slug", "defult_name", "type", "is_active", "created_at", "updated_at")
+TRANSLATION_FIELDS = (
+    "name", "description", "website", "logo", "banner",
+    "address", "city", "state", "country", "postal_code", "logo_variants", "banner_variants",
+)
+
+
+def negotiate_language(lang: Optional[LanguageEnum], accept_language: Optional[str]) -> LanguageEnum:
+    """
+    `?lang=` if given, else the preferred Accept-Language entry we have.
+
+    Entries are tried by q-value; each matches a language exactly ("fr-CH")
+    or by its primary subtag ("fr", "fr-FR"). Falls back to English.
+    """
+    if lang is not None:
+        return lang
+
+    ranges = []
+    for position, entry in enumerate((accept_language or "").split(",")):
+        tag, _, params = entry.partition(";")
+        tag = tag.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if tag and quality > 0:
+            ranges.append((-quality, position, tag))
+
+    for _, _, tag in sorted(ranges):
+        if tag == "*":
+            return DEFAULT_LANGUAGE
+        for language in LanguageEnum:
+            if language.value.lower() == tag:
+                return language
+        for language in LanguageEnum:
+            if language.value.lower().split("-")[0] == tag.split("-")[0]:
+                return language
+    return DEFAULT_LANGUAGE
+
+
+def requested_language(
+    request: Request,
+    lang: Optional[LanguageEnum] = Query(None, description="Response language; defaults to Accept-Language, then en"),
+) -> LanguageEnum:
+    return negotiate_language(lang, request.headers.get("accept-language"))
+
+
+def translation_options(language: LanguageEnum) -> tuple:
+    """Load only the requested and fallback translations, filtered in SQL."""
+    languages = {ModelLanguageEnum(language.value), ModelLanguageEnum(DEFAULT_LANGUAGE.value)}
+    return (selectinload(Company.translations.and_(CompanyTranslation.language.in_(languages))),)
+
+
+def localize(company: Company, language: LanguageEnum) -> dict:
+    """Flatten a company with its translation in `language` (or the fallback) into one record."""
+    by_language = {translation.language.value: translation for translation in company.translations}
+    translation = by_language.get(language.value) or by_language.get(DEFAULT_LANGUAGE.value)
+
+    data = {field: getattr(company, field) for field in COMPANY_FIELDS}
+    if translation is None:
+        data["name"] = company.defult_name
+        return data
+    data["language"] = LanguageEnum(translation.language.value)
+    data.update((field, getattr(translation, field)) for field in TRANSLATION_FIELDS)
+    return data
+
 
 # ------------------------
 # List Companies (paginated)
 # ------------------------
-@router.get("/", response_model=PaginatedCompanyResponse)
-def list_active_companies(
+@router.get("/", response_model=Union[PaginatedCompanyResponse, CursorPaginatedCompanyResponse])
+async def list_active_companies(
+    request: Request,
     page: int = Query(1, ge=1),
     size: int = Query(10, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque keyset cursor. Pass an empty value to start cursor pagination."
+    ),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How `total` is computed"),
+    language: LanguageEnum = Depends(requested_language),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Company).filter(Company.is_active == True)
-    total = query.count()
-    items = (
-        query.offset((page - 1) * size)
+    stmt = select(Company).where(Company.is_active == True)
+    etag, last_modified = await validators(db, stmt, request, Company.updated_at)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+
+    key = cache_key(request)
+    cached = await cached_response(key)
+    if cached is not None:
+        return set_validators(cached, etag, last_modified)
+
+    page_stmt = stmt.options(*translation_options(language))
+
+    if cursor is not None:
+        items, next_cursor, prev_cursor = await keyset_paginate(db, page_stmt, COMPANY_SORT_KEY, cursor, size)
+        response = await cache_response(key, CursorPaginatedCompanyResponse, {
+            "size": size,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "items": [localize(company, language) for company in items],
+        }, tags=["companies"], replica=from_replica(db))
+        return set_validators(response, etag, last_modified)
+
+    total = await count_rows(db, stmt, Company, count, filtered=True)
+    items = (await db.scalars(
+        page_stmt.order_by(*COMPANY_SORT_KEY)
+        .offset((page - 1) * size)
         .limit(size)
-        .all()
-    )
+    )).all()
+
+    response = await cache_response(key, PaginatedCompanyResponse, {
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": page_count(total, size),
+        "items": [localize(company, language) for company in items],
+    }, tags=["companies"])
+    return set_validators(response, etag, last_modified)
+
+
+# ------------------------
+# Search Companies
+# ------------------------
+@router.get("/search", response_model=PaginatedCompanyResponse)
+async def search_companies(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    lang: Optional[LanguageEnum] = Query(
+        None, description="Only match translations in this language, and respond in it"
+    ),
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    language = negotiate_language(lang, request.headers.get("accept-language"))
+    options = translation_options(language)
 
-    return {
+    if search.is_enabled():
+        # The Typesense client is blocking HTTP, keep it off the event loop
+        total, slugs = await run_in_threadpool(
+            search.search_companies, q, page, size, language=lang.value if lang else None
+        )
+        companies = (await db.scalars(
+            select(Company)
+            .options(*options)
+            .where(Company.slug.in_(slugs), Company.is_active == True)
+        )).all() if slugs else []
+        # Keep the search engine's ranking
+        by_slug = {company.slug: company for company in companies}
+        items = [by_slug[slug] for slug in slugs if slug in by_slug]
+    else:
+        match_language = ModelLanguageEnum(lang.value) if lang else None
+        total, items = await pg_search.search_companies(db, q, page, size, language=match_language, options=options)
+
+    return json_response(PaginatedCompanyResponse, {
         "total": total,
         "page": page,
         "size": size,
-        "pages": ceil(total / size) if total else 0,
-        "items": items,
-    }
+        "pages": page_count(total, size),
+        "items": [localize(company, language) for company in items],
+    }, headers={"Vary": "Accept-Language"})
 
 
 # ------------------------
 # Get Company by slug
 # ------------------------
-@router.get("/{company_slug}", response_model=CompanyResponse)
-def get_company_by_slug(company_slug: str, db: Session = Depends(get_db)):
-    company = db.query(Company).get(company_slug)
+@router.get("/{company_slug}", response_model=LocalizedCompanyResponse)
+async def get_company_by_slug(
+    company_slug: str,
+    request: Request,
+    language: LanguageEnum = Depends(requested_language),
+    db: AsyncSession = Depends(get_read_db),
+):
+    stmt = select(Company).where(Company.slug == company_slug)
+    # Translation changes move the company's updated_at
+    etag, last_modified = await validators(db, stmt, request, Company.updated_at)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+
+    key = cache_key(request)
+    cached = await cached_response(key)
+    if cached is not None:
+        return set_validators(cached, etag, last_modified)
+
+    company = await db.scalar(stmt.options(*translation_options(language)))
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    return company
-
+    response = await cache_response(
+        key, LocalizedCompanyResponse, localize(company, language), tags=[f"company:{company_slug}"],
+        replica=from_replica(db),
+    )
+    return set_validators(response, etag, last_modified)
@@ -1,9 +1,9 @@
 import os
 from pydantic import BaseModel, HttpUrl, field_validator
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from enum import Enum
-from app.core.config import settings
+from app.core.media import media_url, media_variant_urls
 
 # --- Enums ---
 class CompanyTypeEnum(str, Enum):
@@ -68,12 +68,16 @@ class CompanyTranslationResponse(BaseModel):
     state: Optional[str] = None
     country: Optional[str] = None
     postal_code: Optional[str] = None
+    logo_variants: Optional[Dict[str, str]] = None  # {variant: URL}, once rendered
+    banner_variants: Optional[Dict[str, str]] = None
 
     @field_validator("logo", "banner", mode="before")
     def prepend_base_url(cls, v):
-        if v and not v.startswith("http"):
-            return f"{settings.BASE_URL}/{v.lstrip('/')}"
-        return v
+        return media_url(v)
+
+    @field_validator("logo_variants", "banner_variants", mode="before")
+    def variant_urls(cls, v):
+        return media_variant_urls(v)
 
     class Config:
         from_attributes = True
@@ -107,10 +111,46 @@ class CompanyResponse(CompanyBase):
         from_attributes = True
 
 
+class LocalizedCompanyResponse(CompanyBase):
+    """A company flattened with a single translation (null fields when it has none)"""
+    slug: str
+    created_at: datetime
+    updated_at: datetime
+
+    language: Optional[LanguageEnum] = None  # of the translation served
+    name: str
+    description: Optional[str] = None
+    website: Optional[HttpUrl] = None
+    logo: Optional[str] = None
+    banner: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    country: Optional[str] = None
+    postal_code: Optional[str] = None
+    logo_variants: Optional[Dict[str, str]] = None  # {variant: URL}, once rendered
+    banner_variants: Optional[Dict[str, str]] = None
+
+    @field_validator("logo", "banner", mode="before")
+    def prepend_base_url(cls, v):
+        return media_url(v)
+
+    @field_validator("logo_variants", "banner_variants", mode="before")
+    def variant_urls(cls, v):
+        return media_variant_urls(v)
+
+
 # --- Pagination ---
 class PaginatedCompanyResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # null with count=none
     page: int
     size: int
-    pages: int
-    items: List[CompanyResponse]
+    pages: Optional[int] = None
+    items: List[LocalizedCompanyResponse]
+
+
+class CursorPaginatedCompanyResponse(BaseModel):
+    size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    items: List[LocalizedCompanyResponse]
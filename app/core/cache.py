@@ -0,0 +1,316 @@
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import json_serializer
+
+logger = logging.getLogger(__name__)
+
+# Cached bodies are tagged; committing a change to a model drops every entry
+# carrying one of the tags returned by its cache_tags() method.
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU with per-entry TTL.
+
+    With `settle_seconds`, invalidated tags are remembered that long (see
+    recently_invalidated()).
+    """
+
+    blocking = False
+
+    def __init__(self, max_entries: int, settle_seconds: float = 0):
+        self.max_entries = max_entries
+        self.settle_seconds = settle_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._invalidated: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, tags: Iterable[str], ttl: float) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, ()):
+                    self._remove(key)
+                if self.settle_seconds:
+                    self._invalidated[tag] = now
+                    self._invalidated.move_to_end(tag)
+            while len(self._invalidated) > self.max_entries:
+                self._invalidated.popitem(last=False)
+
+    def recently_invalidated(self, tags: Iterable[str]) -> bool:
+        """Whether one of `tags` was invalidated in the last `settle_seconds`."""
+        if not self.settle_seconds:
+            return False
+        since = time.monotonic() - self.settle_seconds
+        with self._lock:
+            return any(self._invalidated.get(tag, since) > since for tag in tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._invalidated.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class RedisCacheBackend:
+    """
+    Shared cache on any Redis-protocol client (redis.Redis, fakeredis, ...).
+
+    Each tag is a set of the keys carrying it, so invalidation doesn't scan.
+    With `settle_seconds`, invalidating a tag also leaves a marker key for that long.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "response-cache:", settle_seconds: float = 0):
+        self.client = client
+        self.prefix = prefix
+        self.settle_seconds = settle_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, tags: Iterable[str], ttl: float) -> None:
+        ttl = max(int(ttl), 1)
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, value, ex=ttl)
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            pipe.sadd(tag_key, key)
+            # Outlives its newest entry; stale members only cost a no-op DEL
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        tag_keys = [self.prefix + "tag:" + tag for tag in tags]
+        if not tag_keys:
+            return
+        pipe = self.client.pipeline()
+        if self.settle_seconds:
+            for tag in tags:
+                pipe.set(self.prefix + "invalidated:" + tag, 1, px=max(int(self.settle_seconds * 1000), 1))
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        members = pipe.execute()[-len(tag_keys):]
+        keys = {self.prefix + (key.decode() if isinstance(key, bytes) else key) for group in members for key in group}
+        self.client.delete(*tag_keys, *keys)
+
+    def recently_invalidated(self, tags: Iterable[str]) -> bool:
+        marker_keys = [self.prefix + "invalidated:" + tag for tag in tags]
+        if not (self.settle_seconds and marker_keys):
+            return False
+        return self.client.exists(*marker_keys) > 0
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class Invalidator:
+    """
+    Daemon thread running the invalidations of blocking backends, in commit order.
+
+    Commit hooks run on the event loop (async sessions), where a Redis round trip
+    would stall every request; until its turn comes, an entry may still be served.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[Any, Tuple[str, ...]]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, backend, tags: Iterable[str]) -> None:
+        self._queue.put((backend, tuple(tags)))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cache-invalidator", daemon=True)
+                self._thread.start()
+
+    def wait(self) -> None:
+        """Block until every queued invalidation has run."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            backend, tags = self._queue.get()
+            try:
+                backend.invalidate(tags)
+            except Exception:
+                logger.exception("Failed to invalidate cache tags %s", tags)
+            finally:
+                self._queue.task_done()
+
+
+invalidator = Invalidator()
+
+
+def invalidate_tags(backend, tags: Iterable[str]) -> None:
+    """Drop `backend`'s entries carrying `tags`; blocking backends do it on the invalidator thread."""
+    if backend.blocking:
+        invalidator.submit(backend, tags)
+    else:
+        backend.invalidate(tags)
+
+
+def _replica_settle_seconds() -> float:
+    # How far behind a replica in rotation may be: its lag limit, plus the
+    # time it may have drifted past it since its last health check
+    if not settings.DATABASE_REPLICA_URLS:
+        return 0
+    return settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+
+
+def _create_backend():
+    settle_seconds = _replica_settle_seconds()
+    if settings.RESPONSE_CACHE_URL:
+        import redis  # optional dependency, only needed for a shared cache
+
+        return RedisCacheBackend(redis.Redis.from_url(settings.RESPONSE_CACHE_URL), settle_seconds=settle_seconds)
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settle_seconds=settle_seconds)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Swap the cache backend (e.g. a RedisCacheBackend on a fake client)."""
+    global _backend
+    _backend = backend
+
+
+def is_enabled() -> bool:
+    return settings.RESPONSE_CACHE_TTL_SECONDS > 0
+
+
+# --- Route helpers ---
+def cache_key(request: Request) -> str:
+    """Path, sorted query params and Accept-Language."""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}|{request.headers.get('accept-language', '')}"
+
+
+def _json_response(body: bytes, cache_status: str) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Cache": cache_status, "Vary": "Accept-Language"},
+    )
+
+
+async def cached_response(key: str) -> Optional[Response]:
+    """The cached response for `key`, if any."""
+    if not is_enabled():
+        return None
+    backend = get_backend()
+    body = await run_in_threadpool(backend.get, key) if backend.blocking else backend.get(key)
+    return _json_response(body, "HIT") if body is not None else None
+
+
+def _store(backend, key: str, body: bytes, tags: list, replica: bool) -> None:
+    # A replica may not have replayed the commit that dropped these tags yet:
+    # caching what it returned would bring the old entry back until its TTL
+    if replica and backend.recently_invalidated(tags):
+        return
+    backend.set(key, body, tags, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+async def cache_response(key: str, schema: Any, data: Any, tags: Iterable[str], replica: bool = False) -> Response:
+    """
+    Serialize `data` with the route's response schema, cache it under `key` and return it.
+
+    `replica`: `data` was read from a replica (see from_replica()); it isn't
+    cached while one of `tags` was invalidated too recently for the replica to
+    be sure to have the change.
+    """
+    body = json_serializer(schema)(data)
+    if is_enabled():
+        backend = get_backend()
+        args = (backend, key, body, list(tags), replica)
+        if backend.blocking:
+            await run_in_threadpool(_store, *args)
+        else:
+            _store(*args)
+    return _json_response(body, "MISS")
+
+
+def invalidate_cache(*tags: str) -> None:
+    if tags:
+        invalidate_tags(get_backend(), tags)
+
+
+# --- Invalidation: collect tags at flush, drop the entries once committed ---
+@event.listens_for(Session, "after_flush")
+def _collect_cache_tags(session, flush_context):
+    tags = session.info.setdefault("response_cache_tags", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        cache_tags = getattr(obj, "cache_tags", None)
+        if cache_tags is not None:
+            tags.update(cache_tags())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cache_tags(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        invalidate_cache(*tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_cache_tags(session, previous_transaction):
+    # Rolling back a savepoint (begin_nested) leaves the outer transaction's tags pending
+    if not previous_transaction.nested:
+        session.info.pop("response_cache_tags", None)
@@ -0,0 +1,87 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import Select, event, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Conditional GETs: validators come from max(updated_at) and the row count of
+# what a response is built from, so a 304 costs one aggregate query.
+
+Validators = Tuple[str, Optional[datetime]]
+
+
+async def validators(db: AsyncSession, stmt: Select, request: Request, *updated_at_columns: Any) -> Validators:
+    """
+    Weak ETag and Last-Modified for the rows `stmt` selects.
+
+    The aggregate replaces the statement's columns, so pass the listing's
+    filtered statement (or the detail lookup, joined to whatever the response
+    embeds). The request's path, query and Accept-Language go into the ETag,
+    since they pick the page and its representation.
+    """
+    row = (await db.execute(
+        stmt.with_only_columns(*(func.max(column) for column in updated_at_columns), func.count())
+        .order_by(None)
+    )).one()
+    timestamps = [value for value in row[:-1] if value is not None]
+    last_modified = max(timestamps) if timestamps else None
+
+    key = f"{request.url.path}?{request.url.query}|{request.headers.get('accept-language', '')}"
+    digest = hashlib.sha1(repr((key, tuple(row))).encode()).hexdigest()
+    return f'W/"{digest}"', last_modified
+
+
+def _http_date(value: datetime) -> str:
+    # updated_at columns hold naive UTC
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> Optional[Response]:
+    """A 304 when the client's copy is current, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison; If-Modified-Since is ignored when If-None-Match is present
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        fresh = "*" in tags or etag.removeprefix("W/") in tags
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return None
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        fresh = last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+    if not fresh:
+        return None
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> Response:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+    return response
+
+
+# --- Child rows move their parent's updated_at, so the parent's validators cover them ---
+@event.listens_for(Session, "before_flush")
+def _touch_parents(session, flush_context, instances):
+    now = datetime.utcnow()
+    dirty = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in list(session.new) + dirty + list(session.deleted):
+        touched_parent = getattr(obj, "touched_parent", None)
+        if touched_parent is None:
+            continue
+        parent = touched_parent(session)
+        if parent is not None and parent not in session.deleted:
+            parent.updated_at = now
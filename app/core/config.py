@@ -1,7 +1,123 @@
 import os
 
+def _env_bool(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     BASE_URL: str = os.getenv("BASE_URL", "http://localhost:8000")
 
+    # Media URLs: host serving uploaded files (e.g. a CDN), the directory stored paths are
+    # relative to, versioning of content-addressed paths (?v=) and an optional HMAC signing key (&sig=)
+    MEDIA_BASE_URL: str = os.getenv("MEDIA_BASE_URL", BASE_URL)
+    MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", ".")
+    MEDIA_URL_VERSIONING: bool = _env_bool("MEDIA_URL_VERSIONING", "true")
+    MEDIA_URL_SIGNING_KEY: str = os.getenv("MEDIA_URL_SIGNING_KEY", "")
+    # Uploads: size limit, and the chunk size they are streamed to storage in
+    MEDIA_MAX_UPLOAD_BYTES: int = int(os.getenv("MEDIA_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    MEDIA_UPLOAD_CHUNK_BYTES: int = int(os.getenv("MEDIA_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+    MEDIA_UPLOAD_CONCURRENCY: int = int(os.getenv("MEDIA_UPLOAD_CONCURRENCY", "4"))
+    # Where media files live: "local" (under MEDIA_ROOT) or "s3" (any S3-compatible store,
+    # needs boto3; point MEDIA_BASE_URL at the bucket or its CDN). Paths stored in the
+    # database are object keys either way.
+    MEDIA_STORAGE: str = os.getenv("MEDIA_STORAGE", "local")
+    MEDIA_S3_BUCKET: str = os.getenv("MEDIA_S3_BUCKET", "")
+    MEDIA_S3_ENDPOINT_URL: str = os.getenv("MEDIA_S3_ENDPOINT_URL", "")  # MinIO etc.; empty for AWS
+    MEDIA_S3_REGION: str = os.getenv("MEDIA_S3_REGION", "")
+    MEDIA_S3_ACCESS_KEY_ID: str = os.getenv("MEDIA_S3_ACCESS_KEY_ID", "")
+    MEDIA_S3_SECRET_ACCESS_KEY: str = os.getenv("MEDIA_S3_SECRET_ACCESS_KEY", "")
+    MEDIA_S3_MAX_CONNECTIONS: int = int(os.getenv("MEDIA_S3_MAX_CONNECTIONS", "10"))
+    MEDIA_S3_MULTIPART_THRESHOLD_BYTES: int = int(os.getenv("MEDIA_S3_MULTIPART_THRESHOLD_BYTES", str(8 * 1024 * 1024)))
+    MEDIA_S3_MULTIPART_CHUNK_BYTES: int = int(os.getenv("MEDIA_S3_MULTIPART_CHUNK_BYTES", str(8 * 1024 * 1024)))
+    # Lifetime of presigned direct-upload URLs
+    MEDIA_PRESIGN_EXPIRES_SECONDS: int = int(os.getenv("MEDIA_PRESIGN_EXPIRES_SECONDS", "900"))
+    # Image variants ("name:width,..."; "thumb" is what listings show), rendered in worker processes
+    MEDIA_DERIVATIVE_WIDTHS: dict = {
+        name.strip(): int(width)
+        for name, width in (
+            variant.split(":") for variant in os.getenv("MEDIA_DERIVATIVE_WIDTHS", "thumb:320,large:1280").split(",")
+        )
+    }
+    MEDIA_DERIVATIVE_WORKERS: int = int(os.getenv("MEDIA_DERIVATIVE_WORKERS", "2"))
+    MEDIA_WEBP_QUALITY: int = int(os.getenv("MEDIA_WEBP_QUALITY", "80"))
+
+    # Database connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", "true")
+    # Behind PgBouncer (transaction pooling): no client-side pool, no prepared statements
+    DB_PGBOUNCER: bool = _env_bool("DB_PGBOUNCER")
+
+    # Bulk robot import/export: rows per INSERT (and commit), rows per export cursor fetch
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "500"))
+    BULK_EXPORT_BATCH_SIZE: int = int(os.getenv("BULK_EXPORT_BATCH_SIZE", "1000"))
+
+    # Listing counts
+    COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+
+    # Read replicas (comma-separated URLs); empty sends every read to the primary
+    DATABASE_REPLICA_URLS: list = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+    # After a write, the client's reads stick to the primary for this long (cookie)
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    # Response cache for public reads: in-process LRU, or Redis when RESPONSE_CACHE_URL is set
+    # (use Redis with several workers, invalidation only reaches the process that committed)
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "")
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))  # 0 disables
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+    # Validate response data against the response schema before serializing (slower);
+    # off, ORM rows are trusted and written straight to orjson
+    SERIALIZE_VALIDATE_OUTPUT: bool = _env_bool("SERIALIZE_VALIDATE_OUTPUT")
+
+    # Password hashing (argon2): cost parameters (changing them rehashes each password at its
+    # next login), dedicated hashing threads and how many hashes may wait before 503s
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+
+    # JWT signing keys ("kid:secret,..."; empty: SECRET_KEY under kid "default"). Tokens are signed
+    # with JWT_ACTIVE_KID (default: the first key) and verified with the key their kid names;
+    # tokens without a kid use "default". Keep a retired key listed until its tokens expire.
+    SECRET_KEY: str = os.getenv("SECRET_KEY", "56a6ed075d2141d2cd0bb240eebb92f0b12c5297df034ff498a8d1a342c70679")
+    JWT_SIGNING_KEYS: dict = dict(
+        pair.strip().split(":", 1) for pair in os.getenv("JWT_SIGNING_KEYS", "").split(",") if pair.strip()
+    )
+    JWT_ACTIVE_KID: str = os.getenv("JWT_ACTIVE_KID", "")
+    JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    JWT_BACKEND: str = os.getenv("JWT_BACKEND", "jose")  # or "pyjwt" (needs PyJWT)
+    # Verified tokens remembered (until their exp) so repeat requests skip the signature check
+    JWT_VERIFY_CACHE_SIZE: int = int(os.getenv("JWT_VERIFY_CACHE_SIZE", "4096"))
+
+    # Refresh token store: "database" (refresh_tokens table) or "memory" (per process, for tests)
+    AUTH_REFRESH_TOKEN_STORE: str = os.getenv("AUTH_REFRESH_TOKEN_STORE", "database")
+    # Expired refresh tokens are deleted every interval (0 disables), this many rows per transaction
+    AUTH_REFRESH_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("AUTH_REFRESH_SWEEP_INTERVAL_SECONDS", "3600"))
+    AUTH_REFRESH_SWEEP_BATCH_SIZE: int = int(os.getenv("AUTH_REFRESH_SWEEP_BATCH_SIZE", "5000"))
+
+    # Authenticated users cached by id (0 disables), dropped when a change to the user commits;
+    # shared through RESPONSE_CACHE_URL when set, else per process
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    # Let get_current_principal trust the is_active/is_verified claims of access tokens, with no
+    # lookup at all: a deactivation then only takes effect when the user's tokens expire
+    AUTH_TRUST_TOKEN_CLAIMS: bool = _env_bool("AUTH_TRUST_TOKEN_CLAIMS")
+
+    # Typesense search (disabled when TYPESENSE_HOST is unset)
+    TYPESENSE_HOST: str = os.getenv("TYPESENSE_HOST", "")
+    TYPESENSE_PORT: int = int(os.getenv("TYPESENSE_PORT", "8108"))
+    TYPESENSE_PROTOCOL: str = os.getenv("TYPESENSE_PROTOCOL", "http")
+    TYPESENSE_API_KEY: str = os.getenv("TYPESENSE_API_KEY", "")
+    SEARCH_BATCH_SIZE: int = int(os.getenv("SEARCH_BATCH_SIZE", "100"))
+    SEARCH_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("SEARCH_FLUSH_INTERVAL_SECONDS", "1.0"))
+
 settings = Settings()
 
@@ -0,0 +1,125 @@
+import enum
+import threading
+import time
+from math import ceil
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Select, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+class CountStrategy(str, enum.Enum):
+    EXACT = "exact"          # SELECT count(*) on every request
+    CACHED = "cached"        # exact count, cached per query for COUNT_CACHE_TTL_SECONDS
+    ESTIMATED = "estimated"  # pg_class.reltuples for unfiltered lists, cached otherwise
+    NONE = "none"            # skip counting, total/pages are omitted
+
+
+# --- Cache of exact counts ---
+# {table name: {query key: (expires_at, count)}}
+_count_cache: Dict[str, Dict[Tuple[str, str], Tuple[float, int]]] = {}
+_count_cache_lock = threading.Lock()
+
+
+def _query_key(stmt: Select) -> Tuple[str, str]:
+    compiled = stmt.compile()
+    return str(compiled), repr(sorted(compiled.params.items()))
+
+
+async def _exact_count(db: AsyncSession, stmt: Select) -> int:
+    return await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+
+def invalidate_counts(*table_names: str) -> None:
+    """Drop every cached count computed over the given tables."""
+    with _count_cache_lock:
+        for table_name in table_names:
+            _count_cache.pop(table_name, None)
+
+
+async def _cached_count(db: AsyncSession, stmt: Select, table_name: str) -> int:
+    key = _query_key(stmt)
+    now = time.monotonic()
+
+    with _count_cache_lock:
+        entry = _count_cache.get(table_name, {}).get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    total = await _exact_count(db, stmt)
+    with _count_cache_lock:
+        _count_cache.setdefault(table_name, {})[key] = (now + settings.COUNT_CACHE_TTL_SECONDS, total)
+    return total
+
+
+async def _estimated_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """Planner estimate from pg_class; None when unavailable (not Postgres, never analyzed)."""
+    if db.bind.dialect.name != "postgresql":
+        return None
+
+    estimate = (await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    )).scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
+
+
+async def count_rows(
+    db: AsyncSession,
+    stmt: Select,
+    model,
+    strategy: CountStrategy = CountStrategy.CACHED,
+    filtered: bool = False,
+) -> Optional[int]:
+    """
+    Count the rows of a list statement according to `strategy`.
+
+    `filtered` marks queries whose WHERE clause narrows the table; those can't
+    use the table-wide planner estimate and fall back to a cached exact count.
+    """
+    table_name = model.__table__.name
+
+    if strategy == CountStrategy.NONE:
+        return None
+    if strategy == CountStrategy.EXACT:
+        return await _exact_count(db, stmt)
+    if strategy == CountStrategy.ESTIMATED and not filtered:
+        estimate = await _estimated_count(db, table_name)
+        if estimate is not None:
+            return estimate
+    return await _cached_count(db, stmt, table_name)
+
+
+def page_count(total: Optional[int], size: int) -> Optional[int]:
+    if total is None:
+        return None
+    return ceil(total / size) if total > 0 else 0
+
+
+# --- Invalidate cached counts once writes are committed ---
+@event.listens_for(Session, "after_flush")
+def _collect_written_tables(session, flush_context):
+    written = session.info.setdefault("count_cache_dirty_tables", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            written.add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_tables(session):
+    written = session.info.pop("count_cache_dirty_tables", None)
+    if written:
+        invalidate_counts(*written)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_written_tables(session, previous_transaction):
+    # Only the root transaction's rollback discards; a savepoint's keeps the outer writes
+    if not previous_transaction.nested:
+        session.info.pop("count_cache_dirty_tables", None)
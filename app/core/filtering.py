@@ -0,0 +1,62 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Select, cast, func, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Operators available to filter specs: name -> (column, value) -> SQL expression
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": lambda column, value: column == value,
+    "in": lambda column, value: column.in_(value),
+    "gte": lambda column, value: column >= value,
+    "lte": lambda column, value: column <= value,
+    # JSON array contains every given element (jsonb @>), served by a GIN index on the cast
+    "contains": lambda column, value: cast(column, JSONB).contains(value),
+}
+
+
+def apply_filters(stmt: Select, params: BaseModel, spec: Dict[str, Tuple[Any, str]]) -> Select:
+    """
+    Apply a declarative filter spec to a select statement.
+
+    `spec` maps a field of `params` to (column, operator); fields left unset
+    (None or empty list) are ignored.
+    """
+    for field, (column, operator) in spec.items():
+        value = getattr(params, field)
+        if value is None or value == []:
+            continue
+        stmt = stmt.where(OPERATORS[operator](column, value))
+    return stmt
+
+
+def is_filtered(params: BaseModel) -> bool:
+    """Whether any filter field is set."""
+    return any(value is not None and value != [] for value in params.model_dump().values())
+
+
+async def facet_counts(db: AsyncSession, stmt: Select, columns: Sequence[Any]) -> Dict[str, List[dict]]:
+    """
+    Row counts per distinct value of each column, in a single GROUP BY GROUPING SETS query.
+
+    `stmt` carries the active filters; the facets are computed over its rows.
+    """
+    grouping = [func.grouping(column) for column in columns]
+    rows = (await db.execute(
+        stmt.with_only_columns(*columns, *grouping, func.count())
+        .order_by(None)
+        .group_by(func.grouping_sets(*[tuple_(column) for column in columns]))
+    )).all()
+
+    facets: Dict[str, List[dict]] = {column.key: [] for column in columns}
+    for row in rows:
+        values, flags, count = row[:len(columns)], row[len(columns):-1], row[-1]
+        # grouping(col) = 0 marks the grouping set the row belongs to
+        for column, value, flag in zip(columns, values, flags):
+            if flag == 0:
+                facets[column.key].append({"value": value, "count": count})
+
+    for buckets in facets.values():
+        buckets.sort(key=lambda bucket: -bucket["count"])
+    return facets
@@ -0,0 +1,86 @@
+import hashlib
+import hmac
+import posixpath
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import quote, urlencode
+
+from app.core.config import settings
+
+# Stored uploads are named by their content's SHA-256 (app.media.storage), variants <digest>_<name>.webp
+_CONTENT_ADDRESSED = re.compile(r"^([0-9a-f]{64})(?:_[\w-]+)?(?:\.[a-z0-9]+)?$")
+
+
+class MediaUrlBuilder:
+    """
+    Public URLs for stored media paths, computed once per path (LRU).
+
+    Relative paths are served from `base_url` (the app, or a CDN host). With
+    `versioned`, content-addressed paths get a `v` query param from the digest
+    in their name, marking the URL immutable so it can be cached forever; other
+    paths (older uploads, direct uploads) are served unversioned. With a
+    `signing_key`, an HMAC `sig` param lets the CDN reject URLs that weren't
+    issued by us. Absolute URLs pass through. Nothing here touches storage.
+    """
+
+    def __init__(self, base_url: str, versioned: bool = True, signing_key: str = "", max_entries: int = 10000):
+        self.base_url = base_url.rstrip("/")
+        self.versioned = versioned
+        self.signing_key = signing_key.encode()
+        self.max_entries = max_entries
+        self._urls: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def url(self, path: Optional[str]) -> Optional[str]:
+        if not path or path.startswith(("http://", "https://")):
+            return path
+        with self._lock:
+            url = self._urls.get(path)
+            if url is not None:
+                self._urls.move_to_end(path)
+                return url
+        url = self._build(path)
+        with self._lock:
+            self._urls[path] = url
+            while len(self._urls) > self.max_entries:
+                self._urls.popitem(last=False)
+        return url
+
+    def _build(self, path: str) -> str:
+        relative = path.lstrip("/")
+        params = {}
+        if self.versioned:
+            version = content_version(relative)
+            if version:
+                params["v"] = version
+        if self.signing_key:
+            message = relative + (f"?v={params['v']}" if "v" in params else "")
+            params["sig"] = hmac.new(self.signing_key, message.encode(), hashlib.sha256).hexdigest()[:16]
+
+        url = f"{self.base_url}/{quote(relative)}"
+        return f"{url}?{urlencode(params)}" if params else url
+
+
+def content_version(path: str) -> Optional[str]:
+    """Version of a content-addressed path, read from its name (None for other paths)."""
+    match = _CONTENT_ADDRESSED.match(posixpath.basename(path))
+    return match.group(1)[:12] if match else None
+
+
+media_urls = MediaUrlBuilder(
+    settings.MEDIA_BASE_URL,
+    versioned=settings.MEDIA_URL_VERSIONING,
+    signing_key=settings.MEDIA_URL_SIGNING_KEY,
+)
+
+
+def media_url(path: Optional[str]) -> Optional[str]:
+    """Public URL of a stored media path (logo, banner, ...), as served to API and admin clients."""
+    return media_urls.url(path)
+
+
+def media_variant_urls(variants: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """Public URLs of an image's stored variants ({variant: path})."""
+    return {name: media_urls.url(path) for name, path in variants.items()} if variants else variants
@@ -0,0 +1,148 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(values: Sequence[Any], direction: str = "next") -> str:
+    """Encode the sort key of a row into an opaque, URL-safe cursor."""
+    payload = json.dumps({"v": list(values), "d": direction}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[List[Any], str]:
+    """Decode a cursor produced by `encode_cursor` into (values, direction)."""
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values, direction = payload["v"], payload["d"]
+    except (ValueError, KeyError, TypeError):
+        raise invalid_cursor
+
+    if not isinstance(values, list) or direction not in ("next", "prev"):
+        raise invalid_cursor
+    return values, direction
+
+
+def _coerce(column, value: Any) -> Any:
+    """A cursor value (JSON: dates and decimals are strings) as `column`'s Python type."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    # asyncpg binds by declared type: a string where NUMERIC/TIMESTAMP is expected fails
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(str(value))
+    if python_type in (int, float):
+        return python_type(value)
+    if not isinstance(value, python_type):
+        raise TypeError(value)
+    return value
+
+
+def sort_clauses(columns: Sequence[Any], descending: bool = False) -> list:
+    """ORDER BY clauses for a sort key; NULLs sort as the largest value either way."""
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def _seek_predicate(columns: Sequence[Any], values: Sequence[Any], after: bool):
+    """
+    Rows strictly after (or before) `values` in ascending key order.
+
+    Postgres sorts NULL as the largest value (NULLS LAST ascending, NULLS FIRST
+    descending), so a nullable leading sort column is handled explicitly; the
+    remaining columns must be non-nullable (the tiebreaker).
+    """
+    key = tuple_(*columns)
+    bound = tuple(values)
+    leading = columns[0]
+
+    if not getattr(leading.expression, "nullable", False):
+        return key > bound if after else key < bound
+
+    rest, rest_bound = tuple_(*columns[1:]), tuple(values[1:])
+    if values[0] is None:
+        if after:
+            return and_(leading.is_(None), rest > rest_bound)
+        return or_(leading.isnot(None), rest < rest_bound)
+    if after:
+        return or_(key > bound, leading.is_(None))
+    return key < bound
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    stmt: Select,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    size: int,
+    descending: bool = False,
+) -> Tuple[list, Optional[str], Optional[str]]:
+    """
+    Seek pagination over `columns` (sort column(s) followed by a unique tiebreaker).
+
+    Instead of OFFSET, the page is located with a row-value comparison
+    `(col1, col2) > (:v1, :v2)` so Postgres can walk a matching btree index
+    and deep pages cost the same as the first one.
+
+    Returns (items, next_cursor, prev_cursor).
+    """
+    direction = "next"
+
+    if cursor:
+        values, direction = decode_cursor(cursor)
+        try:
+            if len(values) != len(columns):
+                raise ValueError(values)
+            values = [_coerce(column, value) for column, value in zip(columns, values)]
+        except (ValueError, TypeError, InvalidOperation):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        # Moving forward in a descending listing means moving backward in key order
+        after = (direction == "next") != descending
+        stmt = stmt.where(_seek_predicate(columns, values, after))
+
+    # Walk backwards from the cursor when fetching the previous page
+    stmt = stmt.order_by(*sort_clauses(columns, descending=(direction == "prev") != descending))
+
+    # Fetch one extra row to know whether another page exists
+    rows = list((await db.scalars(stmt.limit(size + 1))).all())
+    has_more = len(rows) > size
+    items = rows[:size]
+    if direction == "prev":
+        items.reverse()
+
+    def key_of(item) -> List[Any]:
+        return [getattr(item, column.key) for column in columns]
+
+    next_cursor = prev_cursor = None
+    if items:
+        if direction == "next":
+            if has_more:
+                next_cursor = encode_cursor(key_of(items[-1]), "next")
+            if cursor:
+                prev_cursor = encode_cursor(key_of(items[0]), "prev")
+        else:
+            next_cursor = encode_cursor(key_of(items[-1]), "next")
+            if has_more:
+                prev_cursor = encode_cursor(key_of(items[0]), "prev")
+
+    return items, next_cursor, prev_cursor
@@ -0,0 +1,124 @@
+import enum
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Optional, Type, Union, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+
+# Values orjson writes exactly as Pydantic would (Decimal through _default)
+_PASSTHROUGH = (str, int, float, bool, Decimal, datetime, date, type(None))
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_passthrough(annotation: Any) -> bool:
+    if annotation is Any:
+        return True
+    if isinstance(annotation, type):
+        return issubclass(annotation, _PASSTHROUGH + (enum.Enum,))
+    origin = get_origin(annotation)
+    if origin in (list, tuple, dict):
+        return all(_is_passthrough(arg) for arg in get_args(annotation))
+    return False
+
+
+def _value_converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """How to turn a trusted attribute into a JSON-ready value; None when it already is one."""
+    annotation = _unwrap_optional(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        nested = orm_serializer(annotation)
+        return lambda value: None if value is None else nested(value)
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation) or (Any,)
+        item = _unwrap_optional(item)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            nested = orm_serializer(item)
+            return lambda value: None if value is None else [nested(element) for element in value]
+    if _is_passthrough(annotation):
+        return None
+    # Anything else (HttpUrl, ...) is normalized by Pydantic; the same values recur, so memoize
+    adapter = TypeAdapter(annotation)
+
+    @lru_cache(maxsize=4096)
+    def normalize(value):
+        return adapter.dump_python(adapter.validate_python(value), mode="json")
+
+    return lambda value: None if value is None else normalize(value)
+
+
+@lru_cache(maxsize=None)
+def orm_serializer(schema: Type[BaseModel]) -> Callable[[Any], dict]:
+    """
+    Compile a schema into a function reading a trusted object (ORM row or dict) into JSON-ready data.
+
+    Output matches schema.model_validate(obj).model_dump(mode="json") for data that
+    passes validation, but nothing is validated: "before" field validators are
+    applied, constraints are not checked.
+    """
+    before_validators = {}
+    for decorator in schema.__pydantic_decorators__.field_validators.values():
+        if decorator.info.mode == "before":
+            for name in decorator.info.fields:
+                before_validators.setdefault(name, []).append(getattr(schema, decorator.cls_var_name))
+
+    fields = []
+    for name, field in schema.model_fields.items():
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        fields.append((name, default, before_validators.get(name, ()), _value_converter(field.annotation)))
+
+    def serialize(obj: Any) -> dict:
+        data = {}
+        if isinstance(obj, dict):
+            loaded, obj = obj, None
+        else:
+            # Loaded ORM attributes sit in the instance __dict__; reading them there skips the descriptors
+            loaded = obj.__dict__
+        for name, default, validators, convert in fields:
+            value = loaded[name] if name in loaded else getattr(obj, name, default)
+            for validator in validators:
+                value = validator(value)
+            data[name] = value if convert is None else convert(value)
+        return data
+
+    return serialize
+
+
+def _validated_serializer(schema: Any) -> Callable[[Any], bytes]:
+    adapter = TypeAdapter(schema)
+    return lambda data: adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+@lru_cache(maxsize=None)
+def json_serializer(schema: Any) -> Callable[[Any], bytes]:
+    """
+    Precompiled `data -> JSON bytes` for a response schema.
+
+    With SERIALIZE_VALIDATE_OUTPUT off (the default) ORM data is trusted and
+    written straight to orjson; otherwise it goes through full Pydantic validation.
+    """
+    if settings.SERIALIZE_VALIDATE_OUTPUT or not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+        return _validated_serializer(schema)
+    to_data = orm_serializer(schema)
+    return lambda data: orjson.dumps(to_data(data), default=_default)
+
+
+def json_response(schema: Any, data: Any, **kwargs) -> Response:
+    """A JSON response for `data` shaped by `schema`, skipping FastAPI's response_model pass."""
+    return Response(content=json_serializer(schema)(data), media_type="application/json", **kwargs)
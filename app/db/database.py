@@ -1,4 +1,8 @@
-from .base import SessionLocal
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from .base import SessionLocal, AsyncSessionLocal
+from .replicas import replica_router, reads_from_primary
 
 # Dependency for FastAPI routes
 def get_db():
@@ -7,3 +11,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async dependency for FastAPI routes
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Async dependency for read-only routes: a healthy replica, or the primary when
+# none is available or the client has just written and must see its own writes
+async def get_read_db(request: Request):
+    replica = None if reads_from_primary(request) else replica_router.choose()
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with replica.sessionmaker() as db:
+        db.info["replica"] = True
+        try:
+            yield db
+        except DBAPIError as exc:
+            if exc.connection_invalidated or isinstance(exc, (InterfaceError, OperationalError)):
+                replica_router.mark_unhealthy(replica)
+            raise
+
+
+def from_replica(db) -> bool:
+    """Whether `db` (from get_read_db) reads a replica, which may lag behind recent commits."""
+    return db.info.get("replica", False)
@@ -0,0 +1,110 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import to_async_url
+from app.db.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary; 0 when fully replayed (or not a standby)
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+
+# Set after a successful write; while present, the client's reads go to the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_async_engine(to_async_url(url), echo=False, **engine_options(is_async=True))
+        self.sessionmaker = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        self.healthy = True
+
+    async def check(self) -> bool:
+        """Reachable and within REPLICA_MAX_LAG_SECONDS of the primary."""
+        try:
+            async with self.engine.connect() as connection:
+                if self.engine.dialect.name == "postgresql":
+                    lag = await connection.scalar(REPLICATION_LAG_SQL)
+                    return lag is None or float(lag) <= settings.REPLICA_MAX_LAG_SECONDS
+                await connection.execute(text("SELECT 1"))
+                return True
+        except Exception:
+            logger.warning("Replica health check failed", exc_info=True)
+            return False
+
+
+class ReplicaRouter:
+    """Round-robin over the healthy replicas; None means use the primary."""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._counter = itertools.count()
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_unhealthy(self, replica: Replica) -> None:
+        if replica.healthy:
+            logger.warning("Removing replica %s from rotation", replica.engine.url.render_as_string())
+        replica.healthy = False
+
+    async def check_all(self) -> None:
+        results = await asyncio.gather(*(replica.check() for replica in self.replicas))
+        for replica, healthy in zip(self.replicas, results):
+            if not healthy:
+                self.mark_unhealthy(replica)
+            elif not replica.healthy:
+                logger.info("Replica %s back in rotation", replica.engine.url.render_as_string())
+                replica.healthy = True
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether this client wrote recently and must read its own writes."""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def mark_writes(request: Request, call_next):
+    """HTTP middleware: pin the client's reads to the primary for a while after a write."""
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
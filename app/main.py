@@ -1,24 +1,54 @@
-from fastapi import FastAPI
-from app.db.base import Base, engine
-from app.company.routes import public as company_public
-# from app.robots.routes import public as robots_public, private as robots_private
-# from app.auth.routes import router as auth_router
+import asyncio
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
+from app.db.base import Base, engine, async_engine
+from app.db.pool import process_pool_status
+from app.db.replicas import replica_router, mark_writes
+from app.company.routes import public as company_public, private as company_private
+from app.robots.routes import public as robots_public, private as robots_private
+from app.auth.routes import router as auth_router
+from app.auth.utils import get_current_principal
 from app.admin.panel import setup_admin
+from app.search import sync as search_sync  # noqa: F401  (registers index sync hooks)
+from app.media import derivatives  # registers image variant hooks
+from app.auth import refresh_tokens
+from app.core.config import settings
+
 
+app = FastAPI(title="Robot Suisse API", default_response_class=ORJSONResponse)
 
-app = FastAPI(title="Robot Suisse API")
+if replica_router.replicas:
+    app.middleware("http")(mark_writes)
 
 
 @app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
+async def on_startup():
+    await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+    if replica_router.replicas:
+        app.state.replica_health_task = asyncio.create_task(replica_router.run_health_checks())
+    if settings.AUTH_REFRESH_SWEEP_INTERVAL_SECONDS > 0:
+        app.state.refresh_sweeper_task = asyncio.create_task(refresh_tokens.run_sweeper())
+
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    for name in ("replica_health_task", "refresh_sweeper_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    derivatives.worker.shutdown()
+    await replica_router.dispose()
+    await async_engine.dispose()
 
-# app.include_router(auth_router, tags=["Authentication"])
+
+app.include_router(auth_router, tags=["Authentication"])
 app.include_router(company_public.router, tags=["Companies"])
-# app.include_router(company_private.router, tags=["Companies Private"])
-# app.include_router(robots_public.router, tags=["Robots"])
-# app.include_router(robots_private.router, tags=["Robots Private"])
+# Write endpoints of the private routers require a bearer token (get_current_principal)
+app.include_router(company_private.router, tags=["Companies Private"])
+# Public first: its fixed paths (/robots/facets, /robots/search) must match before /robots/{slug}
+app.include_router(robots_public.router, tags=["Robots"])
+app.include_router(robots_private.router, tags=["Robots Private"])
 
 
 setup_admin(app)
@@ -26,3 +56,13 @@ setup_admin(app)
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+# Pool internals are for operators, not the public: bearer token required
+@app.get("/health/db-pool", dependencies=[Depends(get_current_principal)])
+def db_pool_status():
+    """Connection pool occupancy and checkout wait times of this worker process."""
+    engines = {"sync": engine, "async": async_engine}
+    for index, replica in enumerate(replica_router.replicas):
+        engines[f"replica-{index}"] = replica.engine
+    return process_pool_status(engines)
@@ -0,0 +1,168 @@
+"""
+Thumbnails and WebP variants of uploaded images, rendered in worker processes.
+
+Committing a stored media path (RobotImage.url, CompanyTranslation.logo/banner)
+queues its variants; once rendered, their paths are stored on the row.
+
+    python -m app.media.derivatives     # backfill rows without variants
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.company.models import CompanyTranslation
+from app.robots.models import RobotImage
+from app.media.images import render_variants
+from app.media.storage import UPLOAD_ROOT, is_media_path
+
+logger = logging.getLogger(__name__)
+
+# Model -> {media path attribute: attribute storing its variants}
+DERIVED_FIELDS = {
+    RobotImage: {"url": "variants"},
+    CompanyTranslation: {"logo": "logo_variants", "banner": "banner_variants"},
+}
+
+# (model, primary key, path attribute, path)
+Job = Tuple[type, object, str, str]
+
+
+def is_stored(path) -> bool:
+    """A path in our media storage, as opposed to an external URL (or anything else a client sent)."""
+    return bool(path) and is_media_path(path)
+
+
+class DerivativeWorker:
+    """Renders variants in a process pool (image decoding is CPU-bound) and stores the results."""
+
+    def __init__(self, workers: int = None):
+        self.workers = workers or settings.MEDIA_DERIVATIVE_WORKERS
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the server process has threads and open connections not worth forking
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, job: Job) -> Future:
+        path = job[3]
+        future = self._pool().submit(
+            render_variants,
+            path,
+            settings.MEDIA_DERIVATIVE_WIDTHS,
+            settings.MEDIA_WEBP_QUALITY,
+        )
+        future.add_done_callback(lambda done: self._store(job, done))
+        return future
+
+    def _store(self, job: Job, future: Future) -> None:
+        model, primary_key, field, path = job
+        try:
+            variants = future.result()
+        except Exception:
+            logger.exception("Rendering variants of %s failed", path)
+            return
+
+        db = SessionLocal()
+        try:
+            obj = db.get(model, primary_key)
+            # Skip rows deleted or pointed at another file meanwhile
+            if obj is not None and getattr(obj, field) == path:
+                setattr(obj, DERIVED_FIELDS[model][field], variants)
+                db.commit()
+        except Exception:
+            logger.exception("Storing variants of %s failed", path)
+            db.rollback()
+        finally:
+            db.close()
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+
+worker = DerivativeWorker()
+
+
+def _changed_paths(obj) -> List[Tuple[str, str]]:
+    fields = DERIVED_FIELDS.get(type(obj))
+    if not fields:
+        return []
+    state = inspect(obj)
+    return [
+        (field, getattr(obj, field))
+        for field in fields
+        if state.attrs[field].history.has_changes()
+    ]
+
+
+# --- New paths drop stale variants at flush and are rendered once committed ---
+@event.listens_for(Session, "before_flush")
+def _reset_variants(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        for field, _ in _changed_paths(obj):
+            setattr(obj, DERIVED_FIELDS[type(obj)][field], None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_derivative_jobs(session, flush_context):
+    jobs = session.info.setdefault("derivative_jobs", [])
+    for obj in list(session.new) + list(session.dirty):
+        for field, path in _changed_paths(obj):
+            if is_stored(path):
+                jobs.append((type(obj), inspect(obj).mapper.primary_key_from_instance(obj)[0], field, path))
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_derivative_jobs(session):
+    for job in session.info.pop("derivative_jobs", ()):
+        worker.submit(job)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_derivative_jobs(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("derivative_jobs", None)
+
+
+def backfill() -> int:
+    """Render variants for every stored media path without them. Returns the job count."""
+    jobs = 0
+    db = SessionLocal()
+    try:
+        for model, fields in DERIVED_FIELDS.items():
+            for field, variants_field in fields.items():
+                column, variants = getattr(model, field), getattr(model, variants_field)
+                rows = db.execute(
+                    select(inspect(model).primary_key[0], column)
+                    .where(column.isnot(None), variants.is_(None))
+                    .where(column.startswith(f"{UPLOAD_ROOT}/"))
+                )
+                for primary_key, path in rows:
+                    if not is_stored(path):
+                        continue
+                    worker.submit((model, primary_key, field, path))
+                    jobs += 1
+    finally:
+        db.close()
+    # Waits for the renders and for the callbacks storing them
+    worker.shutdown(wait=True)
+    return jobs
+
+
+if __name__ == "__main__":
+    print(f"Rendered variants for {backfill()} images")
@@ -0,0 +1,39 @@
+import io
+import os
+from typing import Dict
+
+# Runs in derivative worker processes: keep imports light (no app models, no database)
+
+
+def render_variants(path: str, widths: Dict[str, int], quality: int) -> Dict[str, str]:
+    """
+    Write a WebP variant of the stored image at `path` per named width.
+
+    Variants sit next to the original as <name>_<variant>.webp and are never
+    upscaled. Originals are content-addressed, so an existing variant is
+    reused. Returns {variant: path}.
+    """
+    from PIL import Image, ImageOps
+    from app.media.storage import get_storage
+
+    storage = get_storage()
+    base = os.path.splitext(path)[0]
+    variants = {name: f"{base}_{name}.webp" for name in widths}
+    missing = [name for name, variant_path in variants.items() if not storage.exists(variant_path)]
+    if not missing:
+        return variants
+
+    with Image.open(io.BytesIO(storage.read(path))) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.mode in ("LA", "P", "PA") else "RGB")
+
+        for name in missing:
+            width = widths[name]
+            variant = image.copy()
+            if variant.width > width:
+                variant.thumbnail((width, variant.height * width // variant.width + 1), Image.LANCZOS)
+            encoded = io.BytesIO()
+            variant.save(encoded, "WEBP", quality=quality, method=4)
+            storage.write(variants[name], encoded.getvalue(), "image/webp")
+    return variants
@@ -0,0 +1,340 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import threading
+import uuid
+from typing import BinaryIO, Optional
+
+import anyio
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+_SAFE_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+# Every upload directory sits under this one; no other media path is read or written
+UPLOAD_ROOT = "uploads"
+
+# Room for a multipart body's boundaries, part headers and small fields, on top of the file
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Worker threads copying and hashing uploads at once; created on first use (needs the event loop)
+_limiter = None
+
+
+def _upload_limiter() -> anyio.CapacityLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(settings.MEDIA_UPLOAD_CONCURRENCY)
+    return _limiter
+
+
+def _extension(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if _SAFE_EXTENSION.match(extension) else ""
+
+
+def is_media_path(path: str) -> bool:
+    """A normalized relative path inside UPLOAD_ROOT (no absolute paths, no `..`)."""
+    return (
+        "\0" not in path
+        and posixpath.normpath(path) == path
+        and path.startswith(f"{UPLOAD_ROOT}/")
+    )
+
+
+def _check_media_path(path: str) -> None:
+    if not is_media_path(path):
+        raise ValueError(f"Not a media path: {path!r}")
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large, the limit is {max_bytes // (1024 * 1024)} MiB")
+
+
+def _copy_hashed(source: BinaryIO, target: Optional[BinaryIO], max_bytes: int, chunk_size: int) -> str:
+    """Copy `source` into `target` (None: only read it) in chunks, enforcing the size limit; returns the SHA-256."""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        digest.update(chunk)
+        if target is not None:
+            target.write(chunk)
+    return digest.hexdigest()
+
+
+class LocalStorage:
+    """
+    Media files in a local directory (MEDIA_ROOT).
+
+    Only suitable for a single host, or with MEDIA_ROOT on a volume every replica mounts.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _resolve(self, path: str) -> str:
+        """`path` on disk; raises ValueError for anything resolving outside the upload directories."""
+        _check_media_path(path)
+        uploads = os.path.realpath(os.path.join(self.root, UPLOAD_ROOT))
+        # realpath: a symlink can't lead out either
+        resolved = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([uploads, resolved]) != uploads:
+            raise ValueError(f"Not a media path: {path!r}")
+        return resolved
+
+    def save(self, source: BinaryIO, directory: str, extension: str, max_bytes: int, chunk_size: int,
+             content_type: Optional[str] = None) -> str:
+        target_dir = self._resolve(directory)
+        os.makedirs(target_dir, exist_ok=True)
+        # Same directory as the target, so the final rename is atomic
+        fd, temp_path = tempfile.mkstemp(dir=target_dir, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                filename = _copy_hashed(source, temp, max_bytes, chunk_size) + extension
+            if os.path.exists(os.path.join(target_dir, filename)):
+                # Same content already stored: reuse it
+                os.unlink(temp_path)
+            else:
+                os.replace(temp_path, os.path.join(target_dir, filename))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return os.path.join(directory, filename)
+
+    def read(self, path: str) -> bytes:
+        with open(self._resolve(path), "rb") as file:
+            return file.read()
+
+    def write(self, path: str, data: bytes, content_type: Optional[str] = None) -> None:
+        target = self._resolve(path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".write-")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                temp.write(data)
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(self._resolve(path))
+
+    def presign_upload(self, directory: str, extension: str, content_type: str, max_bytes: int,
+                       expires: int) -> dict:
+        raise HTTPException(status_code=501, detail="Direct uploads need the S3 storage backend")
+
+
+class S3Storage:
+    """
+    Media objects in an S3-compatible bucket (AWS, MinIO, ...), keyed by their stored path.
+
+    One client per process: boto3 clients are thread-safe and keep a pool of
+    MEDIA_S3_MAX_CONNECTIONS connections, reused by every upload and worker
+    thread. Files over MEDIA_S3_MULTIPART_THRESHOLD_BYTES go up as multipart uploads.
+    """
+
+    def __init__(self, client, bucket: str, multipart_threshold: int, multipart_chunk_size: int):
+        from boto3.s3.transfer import TransferConfig
+
+        self.client = client
+        self.bucket = bucket
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunk_size,
+        )
+
+    def save(self, source: BinaryIO, directory: str, extension: str, max_bytes: int, chunk_size: int,
+             content_type: Optional[str] = None) -> str:
+        # The key is the content hash, so the file is read once to hash it and once to send it.
+        # Uploads are already spooled locally (seekable); anything else is spooled first.
+        _check_media_path(directory)
+
+        def key(digest: str) -> str:
+            return f"{directory}/{digest}{extension}"
+
+        if source.seekable():
+            start = source.tell()
+            path = key(_copy_hashed(source, None, max_bytes, chunk_size))
+            source.seek(start)
+            return self._put(source, path, content_type)
+        with tempfile.TemporaryFile() as spool:
+            path = key(_copy_hashed(source, spool, max_bytes, chunk_size))
+            spool.seek(0)
+            return self._put(spool, path, content_type)
+
+    def _put(self, source: BinaryIO, path: str, content_type: Optional[str]) -> str:
+        if not self.exists(path):  # same content already stored: reuse it
+            extra = {"ContentType": content_type} if content_type else {}
+            self.client.upload_fileobj(source, self.bucket, path, ExtraArgs=extra, Config=self.transfer_config)
+        return path
+
+    def read(self, path: str) -> bytes:
+        _check_media_path(path)
+        return self.client.get_object(Bucket=self.bucket, Key=path)["Body"].read()
+
+    def write(self, path: str, data: bytes, content_type: Optional[str] = None) -> None:
+        _check_media_path(path)
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=path, Body=data, **extra)
+
+    def exists(self, path: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        _check_media_path(path)
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=path)
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def presign_upload(self, directory: str, extension: str, content_type: str, max_bytes: int,
+                       expires: int) -> dict:
+        """A presigned POST the client sends the file to directly, bypassing the API workers."""
+        _check_media_path(directory)
+        key = f"{directory}/{uuid.uuid4().hex}{extension}"
+        post = self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_bytes]],
+            ExpiresIn=expires,
+        )
+        return {"url": post["url"], "fields": post["fields"], "path": key, "expires_in": expires}
+
+
+def _create_storage():
+    if settings.MEDIA_STORAGE == "s3":
+        import boto3  # optional dependency, only needed for S3 storage
+        from botocore.config import Config
+
+        client = boto3.client(
+            "s3",
+            endpoint_url=settings.MEDIA_S3_ENDPOINT_URL or None,
+            region_name=settings.MEDIA_S3_REGION or None,
+            # Unset: boto3's default credential chain (environment, instance role, ...)
+            aws_access_key_id=settings.MEDIA_S3_ACCESS_KEY_ID or None,
+            aws_secret_access_key=settings.MEDIA_S3_SECRET_ACCESS_KEY or None,
+            config=Config(max_pool_connections=settings.MEDIA_S3_MAX_CONNECTIONS, retries={"mode": "standard"}),
+        )
+        return S3Storage(
+            client,
+            settings.MEDIA_S3_BUCKET,
+            settings.MEDIA_S3_MULTIPART_THRESHOLD_BYTES,
+            settings.MEDIA_S3_MULTIPART_CHUNK_BYTES,
+        )
+    return LocalStorage(settings.MEDIA_ROOT)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = _create_storage()
+    return _storage
+
+
+def set_storage(storage) -> None:
+    """Swap the storage backend (tests, scripts)."""
+    global _storage
+    _storage = storage
+
+
+def _limited_receive(receive, max_bytes: int):
+    received = 0
+
+    async def limited_receive():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_bytes:
+                raise _too_large(settings.MEDIA_MAX_UPLOAD_BYTES)
+        return message
+
+    return limited_receive
+
+
+class UploadLimitRoute(APIRoute):
+    """
+    Route class refusing multipart bodies over MEDIA_MAX_UPLOAD_BYTES (413) before they are parsed.
+
+    Starlette spools a whole multipart body before the handler runs, so the
+    check in save_upload alone would come after receiving all of it. A
+    declared Content-Length over the limit is refused without reading the
+    body; a body without one (chunked) is cut off as soon as it passes the limit.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            if request.headers.get("content-type", "").startswith("multipart/form-data"):
+                max_bytes = settings.MEDIA_MAX_UPLOAD_BYTES + _MULTIPART_OVERHEAD_BYTES
+                content_length = request.headers.get("content-length", "")
+                if content_length.isdigit() and int(content_length) > max_bytes:
+                    raise _too_large(settings.MEDIA_MAX_UPLOAD_BYTES)
+                request = Request(request.scope, _limited_receive(request.receive, max_bytes))
+            return await handler(request)
+
+        return limited_handler
+
+
+async def save_upload(upload: UploadFile, directory: str, max_bytes: int = None) -> str:
+    """
+    Store an uploaded file under `directory` in the media storage and return its path.
+
+    The file is copied in MEDIA_UPLOAD_CHUNK_BYTES chunks in a worker thread,
+    so the event loop never blocks on disk or network. At most
+    MEDIA_UPLOAD_CONCURRENCY uploads are processed at once, so a burst of
+    large files can neither take over the shared threadpool nor starve the
+    loop of CPU. The size limit is enforced exactly as it streams (413);
+    routes taking uploads also use UploadLimitRoute, so an oversized body
+    is refused before it is received at all. Names are the content's
+    SHA-256, so identical uploads share one file and a stored path never
+    changes content.
+    """
+    return await anyio.to_thread.run_sync(
+        get_storage().save,
+        upload.file,
+        directory,
+        _extension(upload.filename),
+        max_bytes or settings.MEDIA_MAX_UPLOAD_BYTES,
+        settings.MEDIA_UPLOAD_CHUNK_BYTES,
+        upload.content_type,
+        limiter=_upload_limiter(),
+    )
+
+
+async def presign_upload(directory: str, filename: str, content_type: str, max_bytes: int = None) -> dict:
+    """
+    Presigned direct upload to `directory`: {url, fields, path, expires_in}.
+
+    The client POSTs the file (multipart form: `fields`, then `file`) to `url`,
+    then stores `path` like any uploaded path. The bytes never reach the API workers.
+    """
+    # Signing is local, but the first call may resolve credentials over the network
+    return await anyio.to_thread.run_sync(
+        get_storage().presign_upload,
+        directory,
+        _extension(filename),
+        content_type,
+        max_bytes or settings.MEDIA_MAX_UPLOAD_BYTES,
+        settings.MEDIA_PRESIGN_EXPIRES_SECONDS,
+    )
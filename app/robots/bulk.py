@@ -0,0 +1,211 @@
+"""
+Bulk robot import (NDJSON or CSV) and streaming NDJSON export.
+
+Import reads the request body as it arrives and writes robots in batches of
+BULK_IMPORT_BATCH_SIZE: one query resolving the batch's slugs, one checking
+its companies, multi-row INSERTs per table (paged within the driver's bind
+parameter limit) and one commit. Bulk inserts skip the ORM session hooks,
+so their side effects (count cache, search index, image variants) are
+triggered here after each commit.
+"""
+import csv
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, List
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.counts import invalidate_counts
+from app.core.serialization import json_serializer
+from app.company.models import Company, generate_unique_slugs, slugify
+from app.media.derivatives import is_stored, worker
+from app.robots.models import Robot, RobotImage
+from app.robots.schemas import RobotCreateWithImages
+from app.search import backend as search
+from app.search.sync import indexer
+
+# Attempts per batch when a concurrent writer takes one of its slugs first
+_SLUG_ATTEMPTS = 3
+# Errors listed in an import report (all are counted)
+_MAX_REPORTED_ERRORS = 100
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    pending = b""
+    async for chunk in body:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig").rstrip("\r")
+
+
+async def ndjson_records(body: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """(line number, record or error message) per non-blank line."""
+    number = 0
+    async for line in _lines(body):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            yield number, orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield number, f"Invalid JSON: {exc}"
+
+
+def _csv_record(row: Dict[str, str]) -> dict:
+    record = {key: value for key, value in row.items() if key and value not in (None, "")}
+    if "tags" in record:
+        record["tags"] = [tag.strip() for tag in record["tags"].split(";") if tag.strip()]
+    if "images" in record:
+        urls = [url.strip() for url in record["images"].split(";") if url.strip()]
+        record["images"] = [{"url": url, "position": i, "is_primary": i == 0} for i, url in enumerate(urls)]
+    return record
+
+
+async def csv_records(body: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """
+    (line number, record) per CSV row; the header names RobotCreateWithImages fields.
+
+    `tags` and `images` (image URLs, the first one primary) are ";"-separated.
+    """
+    header = None
+    record_lines: List[str] = []
+    number = 0
+    async for line in _lines(body):
+        number += 1
+        record_lines.append(line)
+        # A quoted field may span lines: a record is complete once its quotes balance
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+        text, record_lines = "\n".join(record_lines), []
+        if not text.strip():
+            continue
+        row = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+        yield number, _csv_record(dict(zip(header, row)))
+
+
+async def _insert_batch(db: AsyncSession, robots: List[RobotCreateWithImages]) -> tuple:
+    """Insert robots, skipping SKUs that already exist. Returns (inserted rows, (id, url) of their images)."""
+    now = datetime.utcnow()
+    for attempt in range(_SLUG_ATTEMPTS):
+        slugs = await generate_unique_slugs(db, [robot.name for robot in robots], Robot)
+        rows = [
+            {
+                **robot.model_dump(exclude={"slug", "sku", "images"}),
+                "slug": slug,
+                "sku": slugify(robot.sku) if robot.sku else str(uuid.uuid4()),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for robot, slug in zip(robots, slugs)
+        ]
+        try:
+            # executemany form: SQLAlchemy pages the rows into multi-row INSERTs
+            # within the driver's bind parameter limit, however large the batch
+            inserted = set(await db.scalars(
+                insert(Robot).on_conflict_do_nothing(index_elements=[Robot.sku]).returning(Robot.slug), rows
+            ))
+            images = [
+                {**image.model_dump(), "robot_slug": slug, "created_at": now, "updated_at": now}
+                for robot, slug in zip(robots, slugs) if slug in inserted
+                for image in robot.images or ()
+            ]
+            stored = (await db.execute(
+                insert(RobotImage).returning(RobotImage.id, RobotImage.url), images
+            )).all() if images else []
+            await db.commit()
+            return [row for row in rows if row["slug"] in inserted], stored
+        except IntegrityError:
+            # A slug was taken meanwhile: resolve the batch again
+            await db.rollback()
+            if attempt == _SLUG_ATTEMPTS - 1:
+                raise
+
+
+def _after_commit(rows: List[dict], images: list) -> None:
+    invalidate_counts(Robot.__table__.name, RobotImage.__table__.name)
+    if search.is_enabled():
+        indexer.enqueue([("upsert", search.ROBOTS_COLLECTION, search.robot_document(Robot(**row))) for row in rows])
+    for image_id, url in images:
+        if is_stored(url):
+            worker.submit((RobotImage, image_id, "url", url))
+
+
+async def import_robots(db: AsyncSession, records: AsyncIterator[tuple], batch_size: int = None) -> dict:
+    """Validate and insert streamed (line number, record) pairs in batches; returns a report."""
+    batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+    report = {"created": 0, "skipped": 0, "failed": 0, "errors": []}
+
+    def fail(line: int, detail) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < _MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "detail": detail})
+
+    async def flush(batch: List[tuple]) -> None:
+        companies = set(await db.scalars(
+            select(Company.slug).where(Company.slug.in_({robot.company_slug for _, robot in batch}))
+        ))
+        valid = []
+        for line, robot in batch:
+            if robot.company_slug in companies:
+                valid.append(robot)
+            else:
+                fail(line, f"Company {robot.company_slug!r} not found")
+        if not valid:
+            return
+        rows, images = await _insert_batch(db, valid)
+        # Robots not inserted have a SKU that already exists (e.g. a re-import)
+        report["created"] += len(rows)
+        report["skipped"] += len(valid) - len(rows)
+        _after_commit(rows, images)
+
+    batch: List[tuple] = []
+    async for line, record in records:
+        if isinstance(record, str):
+            fail(line, record)
+            continue
+        try:
+            batch.append((line, RobotCreateWithImages.model_validate(record)))
+        except ValidationError as exc:
+            fail(line, exc.errors(include_url=False, include_context=False))
+            continue
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    report["errors"].sort(key=lambda error: error["line"])
+    return report
+
+
+async def export_robots(sessionmaker, batch_size: int = None) -> AsyncIterator[bytes]:
+    """
+    Every robot with its images as NDJSON, in the import format (plus `slug`).
+
+    Rows come from a server-side cursor in chunks of BULK_EXPORT_BATCH_SIZE
+    and are written out chunk by chunk, so memory stays flat whatever the
+    table size. Opens its own session: the response outlives the request's.
+    """
+    batch_size = batch_size or settings.BULK_EXPORT_BATCH_SIZE
+    to_json = json_serializer(RobotCreateWithImages)
+    async with sessionmaker() as db:
+        result = await db.stream_scalars(
+            select(Robot)
+            .options(selectinload(Robot.images))
+            .order_by(Robot.slug)
+            .execution_options(yield_per=batch_size)
+        )
+        async for robots in result.partitions():
+            yield b"".join(to_json(robot) + b"\n" for robot in robots)
@@ -8,21 +8,50 @@ from sqlalchemy import (
     Numeric,
     JSON,
     ForeignKey,
+    Index,
+    Computed,
+    func,
+    select,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, column_property, deferred
 from app.db.base import Base
 
 
+# Robot names, series and tags are product identifiers: index them without stemming
+ROBOT_SEARCH_CONFIG = "simple"
+ROBOT_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{ROBOT_SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{ROBOT_SEARCH_CONFIG}', coalesce(series, '')), 'B') || "
+    f"setweight(to_tsvector('{ROBOT_SEARCH_CONFIG}', coalesce(category, '')), 'C') || "
+    f"setweight(to_tsvector('{ROBOT_SEARCH_CONFIG}', coalesce(tags::text, '')), 'C')"
+)
+
+
 class RobotImage(Base):
     __tablename__ = "robot_images"
+    __table_args__ = (
+        # Primary-image lookup for list pages only touches the (few) primary rows
+        Index(
+            "ix_robot_images_primary",
+            "robot_slug",
+            postgresql_where=text("is_primary"),
+        ),
+        # A robot's images in order: the primary_image fallback and Robot.images;
+        # also serves plain robot_slug lookups (cascading deletes)
+        Index("ix_robot_images_slug_position", "robot_slug", "position", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    robot_slug = Column(String(255), ForeignKey("robots.slug", ondelete="CASCADE"), nullable=False, index=True)
+    robot_slug = Column(String(255), ForeignKey("robots.slug", ondelete="CASCADE"), nullable=False)
 
     url = Column(String(500), nullable=False)
     alt_text = Column(String(255), nullable=True)
     position = Column(Integer, default=0, nullable=False)
     is_primary = Column(Boolean, default=False, nullable=False)
+    # {variant: path} of the WebP renditions of a local url (app.media.derivatives)
+    variants = Column(JSON(none_as_null=True), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -33,9 +62,35 @@ class RobotImage(Base):
     def __repr__(self) -> str:
         return f"<RobotImage id={self.id} robot_slug={self.robot_slug} url={self.url!r} primary={self.is_primary}>"
 
+    def cache_tags(self):
+        """Response cache entries to drop when this row changes."""
+        return [f"robot:{self.robot_slug}"]
+
+    def touched_parent(self, session):
+        """Row whose updated_at moves when this one changes."""
+        return self.robot if self.robot_slug is None else session.get(Robot, self.robot_slug)
+
+
+_IMAGE_THUMBNAIL = func.coalesce(RobotImage.variants["thumb"].as_string(), RobotImage.url)
+
 
 class Robot(Base):
     __tablename__ = "robots"
+    __table_args__ = (
+        # Keyset pagination seeks on (name, slug)
+        Index("ix_robots_name_slug", "name", "slug"),
+        # Common filter + sort combinations of GET /robots/
+        Index("ix_robots_category_name_slug", "category", "name", "slug"),
+        Index("ix_robots_type_name_slug", "robot_type", "name", "slug"),
+        Index("ix_robots_category_price_slug", "category", "unit_price", "slug"),
+        Index("ix_robots_type_payload_slug", "robot_type", "payload_kg", "slug"),
+        Index("ix_robots_price_slug", "unit_price", "slug"),
+        # Tag containment (tags::jsonb @> '["ROS2"]')
+        Index("ix_robots_tags_gin", text("(CAST(tags AS JSONB))"), postgresql_using="gin"),
+        Index("ix_robots_search_vector", "search_vector", postgresql_using="gin"),
+        # Prefix (LIKE 'base-%') lookups of unique slug generation
+        Index("ix_robots_slug_pattern", "slug", postgresql_ops={"slug": "text_pattern_ops"}),
+    )
 
     slug = Column(String(255), primary_key=True, index=True)
     company_slug = Column(String(255), ForeignKey("companies.slug", ondelete="CASCADE"), nullable=False, index=True)
@@ -54,6 +109,25 @@ class Robot(Base):
     )
     company = relationship("Company", back_populates="robots")
 
+    # Thumbnail (else URL) of the primary image, falling back to the first image by position.
+    # Correlated subqueries, so a list page resolves it in the same round trip;
+    # deferred so it is only selected when a response schema asks for it.
+    primary_image = column_property(
+        func.coalesce(
+            select(_IMAGE_THUMBNAIL)
+            .where(RobotImage.robot_slug == slug, RobotImage.is_primary)
+            .order_by(RobotImage.position, RobotImage.id)
+            .limit(1)
+            .scalar_subquery(),
+            select(_IMAGE_THUMBNAIL)
+            .where(RobotImage.robot_slug == slug)
+            .order_by(RobotImage.position, RobotImage.id)
+            .limit(1)
+            .scalar_subquery(),
+        ),
+        deferred=True,
+    )
+
     # Classification
     robot_type = Column(String(50), nullable=True, index=True)
     category = Column(String(100), nullable=True, index=True)
@@ -72,6 +146,9 @@ class Robot(Base):
     lead_time_days = Column(Integer, nullable=True)
     warranty_months = Column(Integer, nullable=True)
 
+    # Full-text search document, maintained by Postgres
+    search_vector = deferred(Column(TSVECTOR, Computed(ROBOT_SEARCH_VECTOR, persisted=True)))
+
     # Ops
     is_active = Column(Boolean, default=True, nullable=False)
     published_at = Column(DateTime, nullable=True)
@@ -79,4 +156,8 @@ class Robot(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     def __repr__(self) -> str:
-        return f"<Robot slug={self.slug!r} name={self.name!r} company={self.company_slug!r} active={self.is_active}>"
\ No newline at end of file
+        return f"<Robot slug={self.slug!r} name={self.name!r} company={self.company_slug!r} active={self.is_active}>"
+
+    def cache_tags(self):
+        """Response cache entries to drop when this row changes."""
+        return [f"robot:{self.slug}"]
@@ -1,53 +1,120 @@
 import uuid
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
 
-from app.db.database import get_db
-from sqlalchemy.orm import Session, joinedload
+from app.db.base import AsyncSessionLocal
+from app.db.database import from_replica, get_async_db, get_read_db
+from app.db.replicas import replica_router, reads_from_primary
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.company.models import slugify, generate_unique_slug
+from app.core.cache import cache_key, cache_response, cached_response
+from app.core.conditional import not_modified, set_validators, validators
+from app.core.loading import loader_options
 
+from app.auth.utils import get_current_principal
+from app.company.models import Company, slugify, add_with_unique_slug
+
+from app.robots.bulk import csv_records, export_robots, import_robots, ndjson_records
 from app.robots.models import Robot
 from app.robots.schemas import RobotResponse, RobotCreate
 
 router = APIRouter(prefix="/robots", tags=["public-robots"])
 
-@router.post("/", response_model=RobotResponse)
-def create_robot(robot_in: RobotCreate, db: Session = Depends(get_db)):
-    slug = generate_unique_slug(db, robot_in.name, model_class=Robot)
+# Everything here but GET /{slug} needs a signed-in, active user
+authenticated = [Depends(get_current_principal)]
+
+
+async def _load_robot(db: AsyncSession, slug: str):
+    return await db.scalar(
+        select(Robot)
+        .options(*loader_options(RobotResponse, Robot))
+        .where(Robot.slug == slug)
+    )
+
+
+@router.post("/", response_model=RobotResponse, dependencies=authenticated)
+async def create_robot(robot_in: RobotCreate, db: AsyncSession = Depends(get_async_db)):
     sku = slugify(robot_in.sku) if robot_in.sku else str(uuid.uuid4())
-    db_robot = Robot(**robot_in.model_dump(exclude={"slug", "sku"}), slug=slug, sku=sku)
-    db.add(db_robot)
-    db.commit()
-    db.refresh(db_robot)
-    return db_robot
+    db_robot = Robot(**robot_in.model_dump(exclude={"slug", "sku"}), sku=sku)
+    slug = await add_with_unique_slug(db, db_robot, robot_in.name)
+    await db.commit()
+    # Reload with relationships eagerly: lazy loads can't run under asyncio
+    return await _load_robot(db, slug)
 
-@router.get("/{slug}", response_model=RobotResponse)
-def get_robot(slug: str, db: Session = Depends(get_db)):
-    robot = (
-        db.query(Robot)
-        .options(
-            joinedload(Robot.images),
-            joinedload(Robot.company)
+
+@router.post("/bulk", dependencies=authenticated)
+async def bulk_import_robots(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create robots from an NDJSON (application/x-ndjson) or CSV (text/csv) body.
+
+    Each record is a RobotCreateWithImages. The body is parsed as it streams in
+    and written in batches; robots whose SKU already exists are skipped.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        records = csv_records(request.stream())
+    elif content_type in ("application/x-ndjson", "application/jsonl", "application/json"):
+        records = ndjson_records(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or text/csv",
         )
-        .filter(Robot.slug == slug)
-        .first()
+    return await import_robots(db, records)
+
+
+@router.get("/export", dependencies=authenticated)
+async def export_robots_ndjson(request: Request):
+    """Stream every robot with its images as NDJSON, in the format POST /robots/bulk accepts."""
+    replica = None if reads_from_primary(request) else replica_router.choose()
+    return StreamingResponse(
+        export_robots(replica.sessionmaker if replica else AsyncSessionLocal),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="robots.ndjson"'},
     )
+
+
+@router.get("/{slug}", response_model=RobotResponse)
+async def get_robot(slug: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    # Image changes move the robot's updated_at; the embedded company has its own
+    etag, last_modified = await validators(
+        db,
+        select(Robot).join(Company, Robot.company_slug == Company.slug).where(Robot.slug == slug),
+        request,
+        Robot.updated_at,
+        Company.updated_at,
+    )
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+
+    key = cache_key(request)
+    cached = await cached_response(key)
+    if cached is not None:
+        return set_validators(cached, etag, last_modified)
+
+    robot = await _load_robot(db, slug)
     if not robot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Robot not found"
         )
-    return robot
+    # The response embeds the company, so its changes drop this entry too
+    response = await cache_response(
+        key, RobotResponse, robot, tags=[f"robot:{slug}", f"company:{robot.company_slug}"], replica=from_replica(db)
+    )
+    return set_validators(response, etag, last_modified)
 
-@router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_robot(slug: str, db: Session = Depends(get_db)):
-    robot = db.query(Robot).filter(Robot.slug == slug).first()
+@router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT, dependencies=authenticated)
+async def delete_robot(slug: str, db: AsyncSession = Depends(get_async_db)):
+    robot = await db.get(Robot, slug)
     if not robot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Robot not found"
         )
-    db.delete(robot)
-    db.commit()
+    await db.delete(robot)
+    await db.commit()
     return None
@@ -1,30 +1,165 @@
-from math import ceil
-from fastapi import APIRouter, Depends, Query
-from app.db.database import get_db
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from app.db.database import get_read_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import not_modified, set_validators, validators
+from app.core.counts import CountStrategy, count_rows, page_count
+from app.core.filtering import apply_filters, facet_counts, is_filtered
+from app.core.loading import loader_options
+from app.core.serialization import json_response
+from app.core.pagination import keyset_paginate, sort_clauses
 from app.robots.models import Robot
-from app.robots.schemas import PaginatedRobotResponse
+from app.search import backend as search
+from app.search import postgres as pg_search
+from app.robots.schemas import (
+    PaginatedRobotResponse,
+    CursorPaginatedRobotResponse,
+    RobotListResponse,
+    RobotFilterParams,
+    RobotFacetsResponse,
+)
 
 router = APIRouter(prefix="/robots", tags=["public-robots"])
 
-@router.get("/", response_model=PaginatedRobotResponse)
-def list_robots(
+# Filter spec: RobotFilterParams field -> (column, operator)
+ROBOT_FILTERS = {
+    "company_slug": (Robot.company_slug, "eq"),
+    "model_number": (Robot.model_number, "eq"),
+    "in_stock": (Robot.in_stock, "eq"),
+    "robot_type": (Robot.robot_type, "in"),
+    "category": (Robot.category, "in"),
+    "subcategory": (Robot.subcategory, "in"),
+    "tags": (Robot.tags, "contains"),
+    "payload_kg_min": (Robot.payload_kg, "gte"),
+    "payload_kg_max": (Robot.payload_kg, "lte"),
+    "reach_mm_min": (Robot.reach_mm, "gte"),
+    "reach_mm_max": (Robot.reach_mm, "lte"),
+    "unit_price_min": (Robot.unit_price, "gte"),
+    "unit_price_max": (Robot.unit_price, "lte"),
+}
+
+# Sort keys: (sort column, unique tiebreaker); prefix the name with "-" for descending
+ROBOT_SORTS = {
+    "name": (Robot.name, Robot.slug),
+    "unit_price": (Robot.unit_price, Robot.slug),
+    "payload_kg": (Robot.payload_kg, Robot.slug),
+    "reach_mm": (Robot.reach_mm, Robot.slug),
+    "created_at": (Robot.created_at, Robot.slug),
+}
+ROBOT_SORT_PATTERN = "^-?(" + "|".join(ROBOT_SORTS) + ")$"
+
+ROBOT_FACETS = (Robot.category, Robot.robot_type)
+
+
+def robot_filter_params(
+    company_slug: Optional[str] = Query(None),
+    model_number: Optional[str] = Query(None),
+    in_stock: Optional[bool] = Query(None),
+    robot_type: List[str] = Query([], description="Any of these robot types (repeat the param)"),
+    category: List[str] = Query([], description="Any of these categories (repeat the param)"),
+    subcategory: List[str] = Query([], description="Any of these subcategories (repeat the param)"),
+    tags: List[str] = Query([], description="Robots tagged with all of these"),
+    payload_kg_min: Optional[Decimal] = Query(None, ge=0),
+    payload_kg_max: Optional[Decimal] = Query(None, ge=0),
+    reach_mm_min: Optional[int] = Query(None, ge=0),
+    reach_mm_max: Optional[int] = Query(None, ge=0),
+    unit_price_min: Optional[Decimal] = Query(None, ge=0),
+    unit_price_max: Optional[Decimal] = Query(None, ge=0),
+) -> RobotFilterParams:
+    return RobotFilterParams(**locals())
+
+
+@router.get("/", response_model=Union[PaginatedRobotResponse, CursorPaginatedRobotResponse])
+async def list_robots(
+    request: Request,
     page: int = Query(1, ge=1),
     size: int = Query(10, le=100),
-    db: Session = Depends(get_db),
+    sort: str = Query("name", pattern=ROBOT_SORT_PATTERN, description="Sort field, '-' prefix for descending"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque keyset cursor. Pass an empty value to start cursor pagination."
+    ),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How `total` is computed"),
+    filters: RobotFilterParams = Depends(robot_filter_params),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    total = db.query(Robot).count()
-    items = (
-        db.query(Robot)
+    stmt = apply_filters(select(Robot), filters, ROBOT_FILTERS)
+    # Image changes move the robot's updated_at, so primary_image is covered
+    etag, last_modified = await validators(db, stmt, request, Robot.updated_at)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+
+    page_stmt = stmt.options(*loader_options(RobotListResponse, Robot))
+    descending = sort.startswith("-")
+    sort_key = ROBOT_SORTS[sort.lstrip("-")]
+
+    if cursor is not None:
+        items, next_cursor, prev_cursor = await keyset_paginate(
+            db, page_stmt, sort_key, cursor, size, descending=descending
+        )
+        response = json_response(CursorPaginatedRobotResponse, {
+            "size": size,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "items": items,
+        })
+        return set_validators(response, etag, last_modified)
+
+    total = await count_rows(db, stmt, Robot, count, filtered=is_filtered(filters))
+    items = (await db.scalars(
+        page_stmt.order_by(*sort_clauses(sort_key, descending))
         .offset((page - 1) * size)
         .limit(size)
-        .all()
-    )
-    return {
+    )).all()
+    response = json_response(PaginatedRobotResponse, {
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": page_count(total, size),
+        "items": items,
+    })
+    return set_validators(response, etag, last_modified)
+
+
+@router.get("/facets", response_model=RobotFacetsResponse)
+async def robot_facets(
+    filters: RobotFilterParams = Depends(robot_filter_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    stmt = apply_filters(select(Robot), filters, ROBOT_FILTERS)
+    return json_response(RobotFacetsResponse, await facet_counts(db, stmt, ROBOT_FACETS))
+
+
+@router.get("/search", response_model=PaginatedRobotResponse)
+async def search_robots(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    options = loader_options(RobotListResponse, Robot)
+
+    if search.is_enabled():
+        # The Typesense client is blocking HTTP, keep it off the event loop
+        total, slugs = await run_in_threadpool(search.search_robots, q, page, size)
+        robots = (await db.scalars(
+            select(Robot).options(*options).where(Robot.slug.in_(slugs))
+        )).all() if slugs else []
+        # Keep the search engine's ranking
+        by_slug = {robot.slug: robot for robot in robots}
+        items = [by_slug[slug] for slug in slugs if slug in by_slug]
+    else:
+        total, items = await pg_search.search_robots(db, q, page, size, options=options)
+
+    return json_response(PaginatedRobotResponse, {
         "total": total,
         "page": page,
         "size": size,
-        "pages": ceil(total / size) if total > 0 else 0,
+        "pages": page_count(total, size),
         "items": items,
-    }
+    })
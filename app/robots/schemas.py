@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from decimal import Decimal
 
 from app.company.schemas import CompanyResponse
+from app.core.media import media_url, media_variant_urls
 
 
 # ==================== RobotImage Schemas ====================
@@ -29,9 +30,14 @@ class RobotImageUpdate(BaseModel):
 class RobotImageResponse(RobotImageBase):
     id: int
     robot_slug: str
+    variants: Optional[Dict[str, str]] = None  # {variant: URL}, once rendered
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("variants", mode="before")
+    def variant_urls(cls, v):
+        return media_variant_urls(v)
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -126,20 +132,65 @@ class RobotListResponse(BaseModel):
     currency: Optional[str] = None
     in_stock: bool
     is_active: bool
-    primary_image: Optional[str] = None  # URL of primary image
-    
+    primary_image: Optional[str] = None  # thumbnail URL of the primary image
+
+    @field_validator("primary_image", mode="before")
+    def prepend_base_url(cls, v):
+        return media_url(v)
+
     model_config = ConfigDict(from_attributes=True)
 
 
 class PaginatedRobotResponse(BaseModel):
     """Paginated list of robots"""
-    total: int
+    total: Optional[int] = None  # null with count=none
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
     items: List[RobotListResponse]
 
 
+class CursorPaginatedRobotResponse(BaseModel):
+    """Keyset-paginated list of robots"""
+    size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    items: List[RobotListResponse]
+
+
+# ==================== Filtering & Facets ====================
+
+class RobotFilterParams(BaseModel):
+    """Filters for robot listings; list fields match any value (IN), tags match all"""
+    company_slug: Optional[str] = None
+    model_number: Optional[str] = None
+    in_stock: Optional[bool] = None
+
+    robot_type: List[str] = []
+    category: List[str] = []
+    subcategory: List[str] = []
+    tags: List[str] = []
+
+    payload_kg_min: Optional[Decimal] = None
+    payload_kg_max: Optional[Decimal] = None
+    reach_mm_min: Optional[int] = None
+    reach_mm_max: Optional[int] = None
+    unit_price_min: Optional[Decimal] = None
+    unit_price_max: Optional[Decimal] = None
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
+class FacetBucket(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+class RobotFacetsResponse(BaseModel):
+    """Robot counts per category and type for the current filters"""
+    category: List[FacetBucket]
+    robot_type: List[FacetBucket]
+
 
 class RobotCreateWithImages(RobotCreate):
     """Create a robot with images in one request"""
@@ -0,0 +1,172 @@
+import time
+from typing import List, Optional, Tuple
+
+import typesense
+from typesense.exceptions import ObjectNotFound
+
+from app.core.config import settings
+
+ROBOTS_COLLECTION = "robots"
+COMPANIES_COLLECTION = "company_translations"
+
+# --- Collection schemas ---
+ROBOTS_SCHEMA = {
+    "name": ROBOTS_COLLECTION,
+    "fields": [
+        {"name": "name", "type": "string"},
+        {"name": "company_slug", "type": "string", "facet": True},
+        {"name": "sku", "type": "string", "optional": True},
+        {"name": "model_number", "type": "string", "optional": True},
+        {"name": "series", "type": "string", "optional": True},
+        {"name": "robot_type", "type": "string", "optional": True, "facet": True},
+        {"name": "category", "type": "string", "optional": True, "facet": True},
+        {"name": "subcategory", "type": "string", "optional": True, "facet": True},
+        {"name": "tags", "type": "string[]", "optional": True, "facet": True},
+        {"name": "unit_price", "type": "float", "optional": True},
+        {"name": "is_active", "type": "bool"},
+        {"name": "updated_at", "type": "int64"},
+    ],
+    "default_sorting_field": "updated_at",
+}
+
+COMPANIES_SCHEMA = {
+    "name": COMPANIES_COLLECTION,
+    "fields": [
+        {"name": "company_slug", "type": "string", "facet": True},
+        {"name": "language", "type": "string", "facet": True},
+        {"name": "name", "type": "string"},
+        {"name": "description", "type": "string", "optional": True},
+        {"name": "city", "type": "string", "optional": True},
+        {"name": "country", "type": "string", "optional": True, "facet": True},
+    ],
+}
+
+COLLECTION_SCHEMAS = {
+    ROBOTS_COLLECTION: ROBOTS_SCHEMA,
+    COMPANIES_COLLECTION: COMPANIES_SCHEMA,
+}
+
+_client = None
+
+
+def is_enabled() -> bool:
+    return bool(settings.TYPESENSE_HOST) or _client is not None
+
+
+def get_client():
+    """Shared Typesense client, built from settings on first use."""
+    global _client
+    if _client is None:
+        _client = typesense.Client({
+            "nodes": [{
+                "host": settings.TYPESENSE_HOST,
+                "port": settings.TYPESENSE_PORT,
+                "protocol": settings.TYPESENSE_PROTOCOL,
+            }],
+            "api_key": settings.TYPESENSE_API_KEY,
+            "connection_timeout_seconds": 2,
+        })
+    return _client
+
+
+def set_client(client) -> None:
+    """Swap the client, e.g. for an in-process stand-in in tests."""
+    global _client
+    _client = client
+
+
+# Each collection name is an alias of a versioned collection (<name>_<version>),
+# so a reindex can build a new version and swap it in without downtime
+def create_collection_version(client, name: str) -> str:
+    """Create an empty, not yet aliased version of collection `name`; returns its name."""
+    version = f"{name}_{time.time_ns() // 1000}"
+    client.collections.create({**COLLECTION_SCHEMAS[name], "name": version})
+    return version
+
+
+def aliased_collection(client, name: str) -> Optional[str]:
+    """The collection alias `name` points at; None if there's no such alias."""
+    try:
+        return client.aliases[name].retrieve()["collection_name"]
+    except ObjectNotFound:
+        return None
+
+
+def ensure_collections(client=None) -> None:
+    """Create any missing collection (a first version behind its alias)."""
+    client = client or get_client()
+    for name in COLLECTION_SCHEMAS:
+        if aliased_collection(client, name) is not None:
+            continue
+        try:
+            # Created before collections were aliased: the next reindex moves it behind one
+            client.collections[name].retrieve()
+            continue
+        except ObjectNotFound:
+            pass
+        client.aliases.upsert(name, {"collection_name": create_collection_version(client, name)})
+
+
+# --- Documents ---
+def robot_document(robot) -> dict:
+    document = {
+        "id": robot.slug,
+        "name": robot.name,
+        "company_slug": robot.company_slug,
+        "sku": robot.sku,
+        "model_number": robot.model_number,
+        "series": robot.series,
+        "robot_type": robot.robot_type,
+        "category": robot.category,
+        "subcategory": robot.subcategory,
+        "tags": robot.tags,
+        "unit_price": float(robot.unit_price) if robot.unit_price is not None else None,
+        "is_active": bool(robot.is_active if robot.is_active is not None else True),
+        "updated_at": int(robot.updated_at.timestamp()) if robot.updated_at else 0,
+    }
+    # Typesense rejects nulls for optional fields, leave them out instead
+    return {key: value for key, value in document.items() if value is not None}
+
+
+def company_translation_document(translation) -> dict:
+    language = translation.language
+    document = {
+        "id": str(translation.id),
+        "company_slug": translation.company_slug,
+        "language": getattr(language, "value", language),
+        "name": translation.name,
+        "description": translation.description,
+        "city": translation.city,
+        "country": translation.country,
+    }
+    return {key: value for key, value in document.items() if value is not None}
+
+
+# --- Queries ---
+def search_robots(q: str, page: int, size: int) -> Tuple[int, List[str]]:
+    """Full-text robot search; returns (total hits, robot slugs in rank order)."""
+    result = get_client().collections[ROBOTS_COLLECTION].documents.search({
+        "q": q,
+        "query_by": "name,model_number,sku,series,category,subcategory,tags",
+        "filter_by": "is_active:true",
+        "page": page,
+        "per_page": size,
+    })
+    return result["found"], [hit["document"]["id"] for hit in result["hits"]]
+
+
+def search_companies(q: str, page: int, size: int, language: Optional[str] = None) -> Tuple[int, List[str]]:
+    """Full-text company search over translations, one hit per company; returns (total, slugs)."""
+    params = {
+        "q": q,
+        "query_by": "name,description,city",
+        "group_by": "company_slug",
+        "group_limit": 1,
+        "page": page,
+        "per_page": size,
+    }
+    if language:
+        params["filter_by"] = f"language:=`{language}`"
+
+    result = get_client().collections[COMPANIES_COLLECTION].documents.search(params)
+    return result["found"], [group["group_key"][0] for group in result["grouped_hits"]]
@@ -0,0 +1,74 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.models import Company, CompanyTranslation, LanguageEnum, TEXT_SEARCH_CONFIGS
+from app.robots.models import Robot, ROBOT_SEARCH_CONFIG
+
+
+def _tsquery(config: str, q: str):
+    return func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), q)
+
+
+async def search_robots(
+    db: AsyncSession, q: str, page: int, size: int, options=()
+) -> Tuple[int, List[Robot]]:
+    """Ranked full-text robot search over robots.search_vector (GIN)."""
+    tsquery = _tsquery(ROBOT_SEARCH_CONFIG, q)
+    stmt = select(Robot).where(Robot.search_vector.op("@@")(tsquery), Robot.is_active == True)
+
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    items = (await db.scalars(
+        stmt.options(*options)
+        .order_by(func.ts_rank_cd(Robot.search_vector, tsquery).desc(), Robot.slug)
+        .offset((page - 1) * size)
+        .limit(size)
+    )).all()
+    return total, list(items)
+
+
+async def search_companies(
+    db: AsyncSession,
+    q: str,
+    page: int,
+    size: int,
+    language: Optional[LanguageEnum] = None,
+    options=(),
+) -> Tuple[int, List[Company]]:
+    """
+    Ranked full-text company search over company_translations.search_vector (GIN).
+
+    Each translation is indexed with its language's configuration, so the query
+    is parsed with the same one; without a language, the per-language queries
+    are OR-ed together. A company ranks by its best matching translation.
+    """
+    if language is not None:
+        tsquery = _tsquery(TEXT_SEARCH_CONFIGS[language], q)
+    else:
+        configs = list(TEXT_SEARCH_CONFIGS.values())
+        tsquery = _tsquery(configs[0], q)
+        for config in configs[1:]:
+            tsquery = tsquery.op("||")(_tsquery(config, q))
+
+    rank = func.max(func.ts_rank_cd(CompanyTranslation.search_vector, tsquery)).label("rank")
+    matches = select(CompanyTranslation.company_slug, rank).where(
+        CompanyTranslation.search_vector.op("@@")(tsquery)
+    )
+    if language is not None:
+        matches = matches.where(CompanyTranslation.language == language)
+    matches = matches.group_by(CompanyTranslation.company_slug).subquery()
+
+    stmt = (
+        select(Company)
+        .join(matches, matches.c.company_slug == Company.slug)
+        .where(Company.is_active == True)
+    )
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    items = (await db.scalars(
+        stmt.options(*options)
+        .order_by(matches.c.rank.desc(), Company.slug)
+        .offset((page - 1) * size)
+        .limit(size)
+    )).all()
+    return total, list(items)
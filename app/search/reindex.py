@@ -0,0 +1,119 @@
+"""
+Rebuild the Typesense collections from Postgres, without search downtime.
+
+    python -m app.search.reindex             # robots and companies
+    python -m app.search.reindex robots
+
+Each collection is rebuilt as a new version while searches keep using the
+current one, then its alias is swapped over and the old version dropped.
+"""
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, select
+from typesense.exceptions import ObjectNotFound
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.company.models import Company, CompanyTranslation
+from app.robots.models import Robot
+from app.search.backend import (
+    ROBOTS_COLLECTION,
+    COMPANIES_COLLECTION,
+    aliased_collection,
+    company_translation_document,
+    create_collection_version,
+    get_client,
+    robot_document,
+)
+
+SOURCES = {
+    "robots": (ROBOTS_COLLECTION, Robot, robot_document),
+    "companies": (COMPANIES_COLLECTION, CompanyTranslation, company_translation_document),
+}
+
+
+def _changed_since(model, since: datetime):
+    if model is CompanyTranslation:
+        # Translation changes move their company's updated_at
+        return select(CompanyTranslation).join(Company).where(Company.updated_at >= since)
+    return select(model).where(model.updated_at >= since)
+
+
+def _import(documents, stmt, to_document, db, batch_size: int) -> set:
+    """Upsert the rows of `stmt` in batches; returns their document ids."""
+    ids = set()
+    batch = []
+    # Server-side cursor, so memory stays flat regardless of table size
+    for row in db.scalars(stmt.execution_options(yield_per=batch_size)):
+        batch.append(to_document(row))
+        if len(batch) >= batch_size:
+            documents.import_(batch, {"action": "upsert"})
+            ids.update(document["id"] for document in batch)
+            batch = []
+    if batch:
+        documents.import_(batch, {"action": "upsert"})
+        ids.update(document["id"] for document in batch)
+    return ids
+
+
+def reindex(collection: str, model, to_document, batch_size: int = None) -> int:
+    """
+    Rebuild a collection into a new version and swap its alias over. Returns the document count.
+
+    Changes committed during the build reach the collection the alias still
+    points at; once swapped, rows changed since the build started are
+    imported again and documents of rows deleted meanwhile removed.
+    """
+    batch_size = batch_size or settings.SEARCH_BATCH_SIZE
+    client = get_client()
+    # updated_at is set by the app, in UTC; the margin covers commits in flight
+    started = datetime.utcnow() - timedelta(seconds=1)
+
+    version = create_collection_version(client, collection)
+    documents = client.collections[version].documents
+    db = SessionLocal()
+    try:
+        try:
+            ids = _import(documents, select(model), to_document, db, batch_size)
+        except BaseException:
+            client.collections[version].delete()
+            raise
+
+        previous = aliased_collection(client, collection)
+        if previous is None:
+            try:
+                # A collection from before aliases: the alias replaces it
+                client.collections[collection].retrieve()
+                previous = collection
+            except ObjectNotFound:
+                pass
+            else:
+                client.collections[collection].delete()
+        client.aliases.upsert(collection, {"collection_name": version})
+        if previous not in (None, collection):
+            client.collections[previous].delete()
+
+        ids |= _import(documents, _changed_since(model, started), to_document, db, batch_size)
+        existing = {str(key) for key in db.scalars(select(inspect(model).primary_key[0]))}
+        deleted = sorted(ids - existing)
+        for start in range(0, len(deleted), batch_size):
+            doomed = ",".join(f"`{document_id}`" for document_id in deleted[start:start + batch_size])
+            documents.delete({"filter_by": f"id:[{doomed}]"})
+    finally:
+        db.close()
+    return len(ids) - len(deleted)
+
+
+def main(argv) -> None:
+    names = argv or list(SOURCES)
+    for name in names:
+        if name not in SOURCES:
+            sys.exit(f"Unknown source {name!r}, expected one of: {', '.join(SOURCES)}")
+    for name in names:
+        count = reindex(*SOURCES[name])
+        print(f"Indexed {count} {name}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,146 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.company.models import CompanyTranslation
+from app.robots.models import Robot
+from app.search.backend import (
+    ROBOTS_COLLECTION,
+    COMPANIES_COLLECTION,
+    company_translation_document,
+    ensure_collections,
+    get_client,
+    is_enabled,
+    robot_document,
+)
+
+logger = logging.getLogger(__name__)
+
+# ("upsert", collection, document) or ("delete", collection, document id)
+IndexOp = Tuple[str, str, object]
+
+
+class SearchIndexer:
+    """
+    Background writer that batches index operations.
+
+    Committed changes are queued and a single daemon thread drains them in
+    batches of up to SEARCH_BATCH_SIZE (or whatever arrived within
+    SEARCH_FLUSH_INTERVAL_SECONDS), so requests never wait on Typesense.
+    """
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None):
+        self.batch_size = batch_size or settings.SEARCH_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.SEARCH_FLUSH_INTERVAL_SECONDS
+        self._queue: "queue.Queue[IndexOp]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._collections_ready = False
+
+    def enqueue(self, ops: List[IndexOp]) -> None:
+        for op in ops:
+            self._queue.put(op)
+        self._ensure_worker()
+
+    def wait(self) -> None:
+        """Block until every queued operation has been applied."""
+        self._queue.join()
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="search-indexer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                self.apply(batch)
+            except Exception:
+                logger.exception("Failed to apply %d search index operations", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def apply(self, ops: List[IndexOp]) -> None:
+        """Apply operations, keeping only the last one per document."""
+        client = get_client()
+        if not self._collections_ready:
+            ensure_collections(client)
+            self._collections_ready = True
+
+        latest: Dict[Tuple[str, str], IndexOp] = {}
+        for op in ops:
+            action, collection, payload = op
+            document_id = payload["id"] if action == "upsert" else payload
+            latest[(collection, document_id)] = op
+
+        upserts: Dict[str, list] = {}
+        deletes: Dict[str, list] = {}
+        for action, collection, payload in latest.values():
+            if action == "upsert":
+                upserts.setdefault(collection, []).append(payload)
+            else:
+                deletes.setdefault(collection, []).append(payload)
+
+        for collection, documents in upserts.items():
+            results = client.collections[collection].documents.import_(documents, {"action": "upsert"})
+            failed = [result for result in results if not result.get("success")]
+            if failed:
+                logger.warning("%d documents rejected by %s: %s", len(failed), collection, failed[:3])
+
+        for collection, document_ids in deletes.items():
+            ids = ",".join(f"`{document_id}`" for document_id in document_ids)
+            client.collections[collection].documents.delete({"filter_by": f"id:[{ids}]"})
+
+
+indexer = SearchIndexer()
+
+
+# --- Incremental sync: collect changes at flush, ship them once committed ---
+@event.listens_for(Session, "after_flush")
+def _collect_search_changes(session, flush_context):
+    if not is_enabled():
+        return
+
+    ops = session.info.setdefault("search_index_ops", [])
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Robot):
+            ops.append(("upsert", ROBOTS_COLLECTION, robot_document(obj)))
+        elif isinstance(obj, CompanyTranslation):
+            ops.append(("upsert", COMPANIES_COLLECTION, company_translation_document(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, Robot):
+            ops.append(("delete", ROBOTS_COLLECTION, obj.slug))
+        elif isinstance(obj, CompanyTranslation):
+            ops.append(("delete", COMPANIES_COLLECTION, str(obj.id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_search_changes(session):
+    ops = session.info.pop("search_index_ops", None)
+    if ops:
+        indexer.enqueue(ops)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_search_changes(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("search_index_ops", None)
@@ -0,0 +1,74 @@
+"""
+Request throughput and latency of the async (asyncpg) read path under concurrency.
+
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.async_load --concurrency 1 8 32
+
+Fills a catalog (the database is wiped), then runs the app in process
+(httpx ASGITransport, one event loop) with N clients each requesting a robot
+list page and a robot detail in turn for --seconds. Clients and app share
+the loop (and a core), so this shows the per-request cost and how latency
+queues with concurrency; point a load generator at a deployed app for
+network-bound numbers.
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from benchmarks.common import print_table, summary_ms
+from benchmarks.database import use_test_database
+
+
+async def client_loop(client, paths, deadline, samples):
+    for path in itertools.cycle(paths):
+        if time.perf_counter() >= deadline:
+            return
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+
+
+async def run(concurrency_levels, seconds, robots):
+    import httpx
+
+    from app.db.base import async_engine
+    from app.main import app
+
+    rows = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for concurrency in concurrency_levels:
+            paths = [
+                path
+                for index in range(concurrency, concurrency + 50)
+                for path in (f"/robots/?cursor=&size=20&category=category-{index % 500}",
+                             f"/robots/robot-{index * 97 % robots}")
+            ]
+            samples = []
+            deadline = time.perf_counter() + seconds
+            await asyncio.gather(*(
+                client_loop(client, paths[offset:] + paths[:offset], deadline, samples)
+                for offset in range(concurrency)
+            ))
+            rows.append((concurrency, f"{len(samples) / seconds:,.0f}", summary_ms(samples)))
+    await async_engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--robots", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    engine = use_test_database()
+    from tests.factories import add_catalog
+
+    add_catalog(engine, robots=args.robots)
+    rows = asyncio.run(run(args.concurrency, args.seconds, args.robots))
+    print_table("GET /robots/ page + /robots/{slug}, in process", ("clients", "requests/s", "latency"), rows)
+
+
+if __name__ == "__main__":
+    main()
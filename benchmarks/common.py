@@ -0,0 +1,32 @@
+"""Timing helpers shared by the benchmark scripts."""
+import statistics
+import timeit
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+
+def per_call_us(function: Callable[[], object], number: int = 1000, repeat: int = 5) -> float:
+    """Best-of-`repeat` microseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summary_ms(samples: Sequence[float]) -> str:
+    """median / p99 / max of `samples` (seconds), in milliseconds."""
+    if not samples:
+        return "no samples"
+    return "median {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms".format(
+        statistics.median(samples) * 1e3, percentile(samples, 0.99) * 1e3, max(samples) * 1e3
+    )
+
+
+def print_table(title: str, header: Tuple[str, ...], rows: Iterable[Tuple]) -> None:
+    rows: List[Tuple[str, ...]] = [tuple(str(cell) for cell in row) for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    print(title)
+    for row in [header, *rows]:
+        print("  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+    print()
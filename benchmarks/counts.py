@@ -0,0 +1,70 @@
+"""
+Listing totals: what each count strategy costs per request.
+
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.counts --robots 200000
+
+Fills the robots table (the database is wiped), then times count_rows for
+every CountStrategy, unfiltered and filtered by category, over the asyncpg
+session the routes use. "cached" is timed warm: one miss per TTL, the rest hits.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import print_table, summary_ms
+from benchmarks.database import use_test_database
+
+
+async def time_strategy(strategy, stmt, filtered, repeat):
+    from app.core.counts import count_rows
+    from app.db.base import AsyncSessionLocal
+    from app.robots.models import Robot
+
+    samples = []
+    async with AsyncSessionLocal() as db:
+        total = await count_rows(db, stmt, Robot, strategy, filtered=filtered)  # warm-up (fills the cache)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await count_rows(db, stmt, Robot, strategy, filtered=filtered)
+            samples.append(time.perf_counter() - start)
+    return total, samples
+
+
+async def run(repeat):
+    from sqlalchemy import select
+
+    from app.core.counts import CountStrategy
+    from app.db.base import async_engine
+    from app.robots.models import Robot
+
+    statements = [
+        ("unfiltered", select(Robot), False),
+        ("category filter", select(Robot).where(Robot.category == "category-7"), True),
+    ]
+    rows = []
+    for label, stmt, filtered in statements:
+        for strategy in CountStrategy:
+            total, samples = await time_strategy(strategy, stmt, filtered, repeat)
+            rows.append((label, strategy.value, total, summary_ms(samples)))
+    await async_engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--robots", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = use_test_database()
+    from app.core.config import settings
+    from tests.factories import add_catalog
+
+    settings.COUNT_CACHE_TTL_SECONDS = 3600
+    add_catalog(engine, robots=args.robots, images=0)
+    rows = asyncio.run(run(args.repeat))
+    print_table(f"count_rows over {args.robots:,} robots", ("query", "strategy", "total", "time"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Setup for the benchmarks that need Postgres: like the tests, they run against
+TEST_DATABASE_URL, a database they wipe.
+"""
+import os
+import sys
+
+
+def use_test_database():
+    """Point the app at TEST_DATABASE_URL with fresh tables; call before importing app modules."""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        sys.exit("Set TEST_DATABASE_URL to a Postgres database the benchmark may wipe")
+    os.environ["DATABASE_URL"] = url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    os.environ["TYPESENSE_HOST"] = ""
+    os.environ["RESPONSE_CACHE_URL"] = ""
+    # Measure the database work, not cached responses
+    os.environ.setdefault("RESPONSE_CACHE_TTL_SECONDS", "0")
+
+    from app.db.base import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine
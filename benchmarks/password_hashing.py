@@ -0,0 +1,76 @@
+"""
+Login bursts against catalog latency: argon2 on the shared threadpool or on its own pool.
+
+    python -m benchmarks.password_hashing --logins 48
+
+Fires N concurrent password verifications while a probe stands in for a
+catalog request (a no-op through the shared threadpool, every 10 ms) and
+records its latency. "shared threadpool" runs argon2 through
+run_in_threadpool as a plain handler would; "hashing pool" uses
+password_hasher, which rejects past PASSWORD_HASH_MAX_PENDING with 503.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.auth.hashing import PasswordHasher
+from app.auth.utils import get_password_hash, verify_and_update_password
+from benchmarks.common import print_table, summary_ms
+
+PASSWORD = "correct horse battery staple"
+
+
+async def catalog_probe(stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await run_in_threadpool(lambda: None)
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def burst(verify, logins, hashed):
+    stop, samples = asyncio.Event(), []
+    probe = asyncio.create_task(catalog_probe(stop, samples))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify(PASSWORD, hashed) for _ in range(logins)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    rejected = sum(isinstance(result, HTTPException) for result in results)
+    return elapsed, logins - rejected, rejected, samples
+
+
+async def run(logins):
+    hashed = get_password_hash(PASSWORD)
+    start = time.perf_counter()
+    verify_and_update_password(PASSWORD, hashed)
+    single = time.perf_counter() - start
+
+    rows = []
+    for label, verify in [
+        ("shared threadpool", lambda password, hashed: run_in_threadpool(verify_and_update_password, password, hashed)),
+        ("hashing pool", PasswordHasher().verify),
+    ]:
+        elapsed, verified, rejected, samples = await burst(verify, logins, hashed)
+        rows.append((label, f"{verified / elapsed:.1f}", rejected, summary_ms(samples)))
+    return single, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=48)
+    args = parser.parse_args()
+
+    single, rows = asyncio.run(run(args.logins))
+    print_table(
+        f"{args.logins} concurrent logins, {single * 1e3:.0f} ms per verify",
+        ("argon2 on", "logins/s", "503s", "catalog probe latency"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
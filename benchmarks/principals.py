@@ -0,0 +1,89 @@
+"""
+Authenticated requests: what resolving the caller costs, per dependency and mode.
+
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.principals
+
+Creates one user (the database is wiped), then times get_current_user and
+get_current_principal for an access token over the asyncpg session the
+routes use: with the principal cache off, warm, and (for the principal)
+with AUTH_TRUST_TOKEN_CLAIMS. Each call gets a fresh session, as a request does.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import event
+
+from benchmarks.common import print_table, summary_ms
+from benchmarks.database import use_test_database
+
+
+async def time_dependency(dependency, token, repeat):
+    from app.db.base import AsyncSessionLocal, async_engine
+
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async with AsyncSessionLocal() as db:
+        await dependency(token=token, db=db)  # warm-up (connects, fills the cache)
+    samples = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                await dependency(token=token, db=db)
+            samples.append(time.perf_counter() - start)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return len(statements) / repeat, samples
+
+
+async def run(repeat):
+    from app.auth.models import User
+    from app.auth.utils import access_token_claims, create_access_token, get_current_principal, get_current_user
+    from app.core.config import settings
+    from app.db.base import AsyncSessionLocal, async_engine
+
+    async with AsyncSessionLocal() as db:
+        user = User(
+            id=str(uuid.uuid4()), email="bench@example.com", username="bench",
+            hashed_password="-", is_active=True, is_verified=True,
+        )
+        db.add(user)
+        await db.commit()
+        token = create_access_token(access_token_claims(user))
+
+    modes = [
+        ("uncached", 0, False),
+        ("principal cache", 3600, False),
+        ("trusted claims", 0, True),
+    ]
+    rows = []
+    for label, ttl, trust in modes:
+        settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS = ttl
+        settings.AUTH_TRUST_TOKEN_CLAIMS = trust
+        for dependency in (get_current_user, get_current_principal):
+            if trust and dependency is get_current_user:
+                continue  # needs the row either way
+            per_call, samples = await time_dependency(dependency, token, repeat)
+            rows.append((dependency.__name__, label, f"{per_call:g}", summary_ms(samples)))
+    await async_engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    use_test_database()
+    rows = asyncio.run(run(args.repeat))
+    print_table("resolving the caller of an authenticated request", ("dependency", "mode", "queries", "time"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Response serialization: the trusted-ORM path against Pydantic validation.
+
+    python -m benchmarks.serialization
+
+Serializes a robot list page and a robot detail (images, company and its
+translations) built in memory, so no database is needed, four ways:
+
+- model_validate + model_dump_json per item (what response_model costs)
+- one TypeAdapter over the whole payload (validate_python + dump_json)
+- json_serializer: orm_serializer + orjson, nothing validated (the default)
+- json_response: the same, wrapped in the Response the routes return
+"""
+import argparse
+from datetime import datetime
+from decimal import Decimal
+import orjson
+from pydantic import TypeAdapter
+
+import app.db.base  # noqa: F401  (models must be imported through it first)
+from app.company.models import Company, CompanyTranslation, CompanyType, LanguageEnum
+from app.core.serialization import json_response, json_serializer
+from app.robots.models import Robot, RobotImage
+from app.robots.schemas import PaginatedRobotResponse, RobotResponse
+from benchmarks.common import per_call_us, print_table
+
+NOW = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def make_company() -> Company:
+    company = Company(
+        slug="acme", defult_name="Acme Robotics", type=CompanyType.MANUFACTURER, is_active=True,
+        created_at=NOW, updated_at=NOW,
+    )
+    company.translations = [
+        CompanyTranslation(
+            id=f"translation-{language.name}", company_slug="acme", language=language, name=f"Acme ({language.value})",
+            description="Industrial arms and mobile platforms. " * 8, website="https://acme.example.com",
+            logo=f"uploads/logos/{'a' * 64}.png", city="Zurich", country="CH",
+        )
+        for language in LanguageEnum
+    ]
+    return company
+
+
+def make_robot(index: int, company: Company, images: int) -> Robot:
+    robot = Robot(
+        slug=f"robot-{index}", name=f"Robot {index}", company_slug=company.slug, sku=f"SKU-{index}",
+        robot_type="industrial_arm", category="welding", tags=["ROS2", "collaborative"],
+        payload_kg=Decimal("12.500"), reach_mm=1400, unit_price=Decimal("24999.00"), currency="CHF",
+        in_stock=True, is_active=True, created_at=NOW, updated_at=NOW,
+    )
+    robot.company = company
+    robot.images = [
+        RobotImage(
+            id=index * 100 + position, robot_slug=robot.slug, url=f"uploads/robots/{position:064x}.jpg",
+            alt_text=f"View {position}", position=position, is_primary=position == 0,
+            variants={"thumb": f"uploads/robots/{position:064x}_thumb.webp"}, created_at=NOW, updated_at=NOW,
+        )
+        for position in range(images)
+    ]
+    # What the list query's column_property selects
+    robot.__dict__["primary_image"] = f"uploads/robots/{0:064x}_thumb.webp"
+    return robot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--images", type=int, default=8, help="images per robot in the detail payload")
+    parser.add_argument("--number", type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+
+    company = make_company()
+    page = {
+        "total": 1000, "page": 1, "size": args.page_size, "pages": 1000 // args.page_size,
+        "items": [make_robot(index, company, images=1) for index in range(args.page_size)],
+    }
+    payloads = [
+        (f"robot list ({args.page_size} items)", PaginatedRobotResponse, page),
+        (f"robot detail ({args.images} images)", RobotResponse, make_robot(0, company, args.images)),
+    ]
+
+    rows = []
+    for label, schema, data in payloads:
+        adapter = TypeAdapter(schema)
+        # The trusted path must write what Pydantic would
+        expected = orjson.loads(adapter.dump_json(adapter.validate_python(data, from_attributes=True)))
+        assert orjson.loads(json_serializer(schema)(data)) == expected, label
+
+        paths = {
+            "model_validate + model_dump_json": lambda: schema.model_validate(data, from_attributes=True).model_dump_json(),
+            "TypeAdapter validate + dump_json": lambda: adapter.dump_json(adapter.validate_python(data, from_attributes=True)),
+            "json_serializer (orm_serializer + orjson)": lambda: json_serializer(schema)(data),
+            "json_response": lambda: json_response(schema, data),
+        }
+        baseline = None
+        for name, function in paths.items():
+            micros = per_call_us(function, number=args.number)
+            baseline = baseline or micros
+            rows.append((label, name, f"{micros:,.1f}", f"{baseline / micros:.1f}x"))
+    print_table("Serialization, best of 5 (µs per payload)", ("payload", "path", "µs", "speed-up"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Event-loop stalls while uploads are stored.
+
+    python -m benchmarks.uploads --uploads 16 --megabytes 8
+
+Stores N parallel uploads into a temporary LocalStorage three ways while a
+probe task sleeps 1 ms in a loop and records how late it wakes up: a plain
+copy on the event loop, and save_upload (chunked copy + hash in worker
+threads) with no concurrency limit and with MEDIA_UPLOAD_CONCURRENCY.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import anyio
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.media import storage
+from benchmarks.common import print_table, summary_ms
+
+
+def make_uploads(count, size):
+    uploads = []
+    for index in range(count):
+        spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        spool.write(os.urandom(size))
+        spool.seek(0)
+        uploads.append(UploadFile(file=spool, filename=f"upload-{index}.png"))
+    return uploads
+
+
+async def inline_copy(upload, directory):
+    # What a handler doing the copy itself does: the whole file on the loop
+    target = os.path.join(settings.MEDIA_ROOT, directory, upload.filename)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as file:
+        shutil.copyfileobj(upload.file, file)
+
+
+async def probe(stop, lateness):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lateness.append(time.perf_counter() - start - 0.001)
+
+
+async def measure(store, uploads):
+    stop, lateness = asyncio.Event(), []
+    probe_task = asyncio.create_task(probe(stop, lateness))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(store(upload, "uploads/bench") for upload in uploads))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    return elapsed, lateness
+
+
+async def run(count, size):
+    rows = []
+    for label, store, limit in [
+        ("copy on the event loop", inline_copy, None),
+        ("save_upload, no limit", storage.save_upload, count),
+        (f"save_upload, limit {settings.MEDIA_UPLOAD_CONCURRENCY}", storage.save_upload,
+         settings.MEDIA_UPLOAD_CONCURRENCY),
+    ]:
+        storage._limiter = anyio.CapacityLimiter(limit) if limit else None
+        elapsed, lateness = await measure(store, make_uploads(count, size))
+        rows.append((label, f"{elapsed * 1e3:,.0f} ms", summary_ms(lateness)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--megabytes", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        settings.MEDIA_ROOT = root
+        storage.set_storage(storage.LocalStorage(root))
+        rows = asyncio.run(run(args.uploads, args.megabytes * 1024 * 1024))
+    print_table(
+        f"{args.uploads} parallel {args.megabytes} MiB uploads",
+        ("store", "all stored in", "event-loop lateness"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
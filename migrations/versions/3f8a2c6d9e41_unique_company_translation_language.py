@@ -0,0 +1,36 @@
+"""unique company translation per language
+
+Revision ID: 3f8a2c6d9e41
+Revises: 7c1e4a9b2d3f
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a2c6d9e41'
+down_revision: Union[str, None] = '7c1e4a9b2d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if a company already has two translations in one language; merge those first.
+    # The constraint's unique index on (company_slug, language) also serves the per-language lookups.
+    # Skipped where Base.metadata.create_all (app startup) already created it.
+    existing = sa.inspect(op.get_bind()).get_unique_constraints("company_translations")
+    if any(constraint["name"] == "uq_company_translations_company_language" for constraint in existing):
+        return
+    op.create_unique_constraint(
+        "uq_company_translations_company_language",
+        "company_translations",
+        ["company_slug", "language"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_company_translations_company_language", "company_translations", type_="unique")
@@ -0,0 +1,65 @@
+"""add full-text search vectors
+
+Revision ID: 7c1e4a9b2d3f
+Revises: c8f4a2e6d9b3
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9b2d3f'
+down_revision: Union[str, None] = 'c8f4a2e6d9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRANSLATION_CONFIG = (
+    "CASE language "
+    "WHEN 'EN' THEN 'english'::regconfig "
+    "WHEN 'DE_CH' THEN 'german'::regconfig "
+    "WHEN 'FR_CH' THEN 'french'::regconfig "
+    "WHEN 'IT_CH' THEN 'italian'::regconfig "
+    "ELSE 'simple'::regconfig END"
+)
+
+TRANSLATION_SEARCH_VECTOR = (
+    f"setweight(to_tsvector({TRANSLATION_CONFIG}, coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector({TRANSLATION_CONFIG}, coalesce(city, '')), 'B') || "
+    f"setweight(to_tsvector({TRANSLATION_CONFIG}, coalesce(description, '')), 'C')"
+)
+
+ROBOT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(series, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(category, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(tags::text, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases bootstrapped by Base.metadata.create_all already have these
+    op.execute(
+        "ALTER TABLE robots ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({ROBOT_SEARCH_VECTOR}) STORED"
+    )
+    op.execute(
+        "ALTER TABLE company_translations ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({TRANSLATION_SEARCH_VECTOR}) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_robots_search_vector ON robots USING gin (search_vector)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_company_translations_search_vector "
+        "ON company_translations USING gin (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_company_translations_search_vector", table_name="company_translations")
+    op.drop_index("ix_robots_search_vector", table_name="robots")
+    op.drop_column("company_translations", "search_vector")
+    op.drop_column("robots", "search_vector")
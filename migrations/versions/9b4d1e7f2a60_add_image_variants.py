@@ -0,0 +1,32 @@
+"""add image variant columns
+
+Revision ID: 9b4d1e7f2a60
+Revises: 3f8a2c6d9e41
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d1e7f2a60'
+down_revision: Union[str, None] = '3f8a2c6d9e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the derivative worker; run `python -m app.media.derivatives` to backfill existing images
+    # IF NOT EXISTS: databases bootstrapped by Base.metadata.create_all already have these
+    op.execute("ALTER TABLE robot_images ADD COLUMN IF NOT EXISTS variants JSON")
+    op.execute("ALTER TABLE company_translations ADD COLUMN IF NOT EXISTS logo_variants JSON")
+    op.execute("ALTER TABLE company_translations ADD COLUMN IF NOT EXISTS banner_variants JSON")
+
+
+def downgrade() -> None:
+    op.drop_column("company_translations", "banner_variants")
+    op.drop_column("company_translations", "logo_variants")
+    op.drop_column("robot_images", "variants")
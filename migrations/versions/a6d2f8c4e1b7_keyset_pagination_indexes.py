@@ -0,0 +1,40 @@
+"""keyset pagination indexes
+
+Revision ID: a6d2f8c4e1b7
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f8c4e1b7'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cursor pages seek on (name, slug); IF NOT EXISTS: create_all makes them on new databases.
+    # CONCURRENTLY (outside a transaction) keeps the tables writable during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_robots_name_slug", "robots", ["name", "slug"], postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_companies_active_name_slug",
+            "companies",
+            ["is_active", "defult_name", "slug"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_companies_active_name_slug", table_name="companies", postgresql_concurrently=True)
+        op.drop_index("ix_robots_name_slug", table_name="robots", postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""partial index on primary robot images
+
+Revision ID: b3e9d5a1c7f4
+Revises: a6d2f8c4e1b7
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9d5a1c7f4'
+down_revision: Union[str, None] = 'a6d2f8c4e1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Robot.primary_image looks up the (few) primary rows per robot
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_robot_images_primary",
+            "robot_images",
+            ["robot_slug"],
+            postgresql_where=sa.text("is_primary"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_robot_images_primary", table_name="robot_images", postgresql_concurrently=True)
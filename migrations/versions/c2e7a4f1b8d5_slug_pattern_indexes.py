@@ -0,0 +1,34 @@
+"""slug prefix indexes
+
+Revision ID: c2e7a4f1b8d5
+Revises: 9b4d1e7f2a60
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7a4f1b8d5'
+down_revision: Union[str, None] = '9b4d1e7f2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The primary key indexes can't serve LIKE 'base-%' under a non-C collation
+    op.create_index(
+        "ix_companies_slug_pattern", "companies", ["slug"], postgresql_ops={"slug": "text_pattern_ops"},
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_robots_slug_pattern", "robots", ["slug"], postgresql_ops={"slug": "text_pattern_ops"}, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_robots_slug_pattern", table_name="robots")
+    op.drop_index("ix_companies_slug_pattern", table_name="companies")
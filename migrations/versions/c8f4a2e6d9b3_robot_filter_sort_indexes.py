@@ -0,0 +1,50 @@
+"""robot filter + sort indexes
+
+Revision ID: c8f4a2e6d9b3
+Revises: b3e9d5a1c7f4
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4a2e6d9b3'
+down_revision: Union[str, None] = 'b3e9d5a1c7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Common filter + sort combinations of GET /robots/ (see Robot.__table_args__)
+INDEXES = {
+    "ix_robots_category_name_slug": ["category", "name", "slug"],
+    "ix_robots_type_name_slug": ["robot_type", "name", "slug"],
+    "ix_robots_category_price_slug": ["category", "unit_price", "slug"],
+    "ix_robots_type_payload_slug": ["robot_type", "payload_kg", "slug"],
+    "ix_robots_price_slug": ["unit_price", "slug"],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY: robots stays writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "robots", columns, postgresql_concurrently=True, if_not_exists=True)
+        # Tag containment (tags::jsonb @> '["ROS2"]')
+        op.create_index(
+            "ix_robots_tags_gin",
+            "robots",
+            [sa.text("(CAST(tags AS JSONB))")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_robots_tags_gin", table_name="robots", postgresql_concurrently=True)
+        for name in reversed(list(INDEXES)):
+            op.drop_index(name, table_name="robots", postgresql_concurrently=True)
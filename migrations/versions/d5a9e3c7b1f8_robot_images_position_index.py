@@ -0,0 +1,48 @@
+"""robot images in position order
+
+Revision ID: d5a9e3c7b1f8
+Revises: f1c3a7e9b5d2
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e3c7b1f8'
+down_revision: Union[str, None] = 'f1c3a7e9b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Robot.primary_image falls back to the first image by (position, id) when none is primary.
+    # The new index leads with robot_slug, so the single-column one is redundant.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_robot_images_slug_position",
+            "robot_images",
+            ["robot_slug", "position", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_robot_images_robot_slug",
+            table_name="robot_images",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_robot_images_robot_slug",
+            "robot_images",
+            ["robot_slug"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index("ix_robot_images_slug_position", table_name="robot_images", postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""add refresh tokens
+
+Revision ID: e4b8c1d6a3f9
+Revises: c2e7a4f1b8d5
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c1d6a3f9'
+down_revision: Union[str, None] = 'c2e7a4f1b8d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases bootstrapped by Base.metadata.create_all already have these
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("jti", sa.String(length=36), primary_key=True),
+        sa.Column("family_id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("used_at", sa.DateTime(), nullable=True),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"], if_not_exists=True)
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"], if_not_exists=True)
+    # The expiry sweeper deletes in expires_at order
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_family_id", table_name="refresh_tokens")
+    op.drop_table("refresh_tokens")
@@ -0,0 +1,29 @@
+"""case-insensitive user email and username
+
+Revision ID: f1c3a7e9b5d2
+Revises: e4b8c1d6a3f9
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3a7e9b5d2'
+down_revision: Union[str, None] = 'e4b8c1d6a3f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if existing users differ only by case: merge or rename them first
+    op.create_index("ux_users_email_lower", "users", [sa.text("lower(email)")], unique=True, if_not_exists=True)
+    op.create_index("ux_users_username_lower", "users", [sa.text("lower(username)")], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ux_users_username_lower", table_name="users")
+    op.drop_index("ux_users_email_lower", table_name="users")
@@ -0,0 +1,80 @@
+"""Rows for tests to query, committed through a sync session (the `db` fixture)."""
+from decimal import Decimal
+
+from sqlalchemy import text
+
+
+def add_company(db, slug: str, name: str = None, languages=("en",), **fields):
+    from app.company.models import Company, CompanyTranslation, CompanyType, LanguageEnum
+
+    company = Company(
+        slug=slug, defult_name=name or slug.title(), type=fields.pop("type", CompanyType.MANUFACTURER), **fields
+    )
+    company.translations = [
+        CompanyTranslation(language=LanguageEnum(language), name=f"{company.defult_name} ({language})")
+        for language in languages
+    ]
+    db.add(company)
+    db.commit()
+    return company
+
+
+def add_robot(db, company_slug: str, slug: str, images: int = 0, **fields):
+    from app.robots.models import Robot, RobotImage
+
+    robot = Robot(slug=slug, company_slug=company_slug, name=fields.pop("name", slug.title()), **fields)
+    robot.images = [
+        RobotImage(url=f"https://images.example.com/{slug}/{position}.jpg", position=position, is_primary=position == 0)
+        for position in range(images)
+    ]
+    db.add(robot)
+    db.commit()
+    return robot
+
+
+def add_catalog(engine, companies: int = 20, robots: int = 20000, images: int = 4) -> None:
+    """
+    A large catalog, inserted in bulk and analyzed: 500 categories, 400 types,
+    2000 tags (plus "common" on every robot), `images` per robot (the first primary).
+    """
+    from app.company.models import Company, CompanyType
+    from app.robots.models import Robot, RobotImage
+
+    with engine.begin() as connection:
+        connection.execute(Company.__table__.insert(), [
+            {"slug": f"company-{index}", "defult_name": f"Company {index}", "type": CompanyType.MANUFACTURER,
+             "is_active": True, "created_at": "2026-01-01", "updated_at": "2026-01-01"}
+            for index in range(companies)
+        ])
+        connection.execute(Robot.__table__.insert(), [
+            {
+                "slug": f"robot-{index}", "company_slug": f"company-{index % companies}", "name": f"Robot {index:05}",
+                "category": f"category-{index % 500}", "robot_type": f"type-{index % 400}",
+                "unit_price": Decimal(1000 + index * 7 % 50000), "payload_kg": Decimal(index % 300),
+                "tags": ["common", f"tag-{index % 2000}"], "in_stock": True,
+                "created_at": "2026-01-01", "updated_at": "2026-01-01",
+            }
+            for index in range(robots)
+        ])
+        if images:
+            connection.execute(RobotImage.__table__.insert(), [
+                {"robot_slug": f"robot-{index}", "url": f"https://images.example.com/{index}/{position}.jpg",
+                 "position": position, "is_primary": position == 0,
+                 "created_at": "2026-01-01", "updated_at": "2026-01-01"}
+                for index in range(robots)
+                for position in range(images)
+            ])
+        for table in ("companies", "robots", "robot_images"):
+            connection.execute(text(f"ANALYZE {table}"))
+
+
+def empty_tables(engine) -> None:
+    """Delete every row, and what was cached from them."""
+    from app.core import cache, counts
+    from app.db.base import Base
+
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    counts._count_cache.clear()
+    cache.get_backend().clear()
@@ -0,0 +1,94 @@
+"""Sessions: login, the principal cache, refresh token rotation and logout."""
+import orjson
+import pytest
+
+from app.auth import principals
+from app.core.cache import MemoryCacheBackend, invalidator
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def tokens(client, db):
+    response = await client.post(
+        "/auth/register", json={"email": "ada@example.com", "username": "ada", "password": "correct horse"}
+    )
+    assert response.status_code == 201, response.text
+    response = await client.post("/auth/login", json={"username": "ada", "password": "correct horse"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.fixture
+def principal_cache(monkeypatch):
+    backend = MemoryCacheBackend(max_entries=100)
+    monkeypatch.setattr(principals.settings, "AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 30)
+    principals.set_backend(backend)
+    yield backend
+    invalidator.wait()
+    principals.set_backend(None)
+
+
+async def test_cached_principal_leaves_the_password_hash_out(client, tokens, principal_cache):
+    first = await client.get("/auth/me", headers=bearer(tokens))
+    assert first.status_code == 200
+
+    cached = orjson.loads(principal_cache.get(first.json()["id"]))
+    assert cached["username"] == "ada"
+    assert "hashed_password" not in cached
+
+    second = await client.get("/auth/me", headers=bearer(tokens))
+    assert second.json() == first.json()
+
+
+async def test_logout_revokes_the_session(client, tokens):
+    response = await client.post("/auth/logout", headers=bearer(tokens), json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+
+    response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+async def test_logout_needs_an_access_token(client, tokens):
+    response = await client.post("/auth/logout")
+    assert response.status_code == 401
+
+
+@pytest.fixture(params=["database", "memory"])
+def store(request):
+    from app.auth import refresh_tokens
+
+    if request.param == "memory":
+        refresh_tokens.set_store(refresh_tokens.MemoryRefreshTokenStore())
+    yield
+    refresh_tokens.set_store(None)
+
+
+async def test_refresh_token_without_jti_is_used_up_on_first_refresh(client, tokens, store):
+    from datetime import timedelta
+
+    from app.auth.utils import create_refresh_token
+
+    user = (await client.get("/auth/me", headers=bearer(tokens))).json()
+    # Issued before refresh tokens carried a jti
+    legacy = create_refresh_token({"sub": user["id"], "username": user["username"]}, expires_delta=timedelta(days=1))
+
+    response = await client.post("/auth/refresh", json={"refresh_token": legacy})
+    assert response.status_code == 200, response.text
+    successor = response.json()["refresh_token"]
+
+    # A replay is reuse: rejected, and the session it started is revoked
+    assert (await client.post("/auth/refresh", json={"refresh_token": legacy})).status_code == 401
+    assert (await client.post("/auth/refresh", json={"refresh_token": successor})).status_code == 401
+
+
+async def test_pool_status_needs_an_access_token(client, tokens):
+    assert (await client.get("/health/db-pool")).status_code == 401
+
+    response = await client.get("/health/db-pool", headers=bearer(tokens))
+    assert response.status_code == 200
+    assert {"sync", "async"} <= set(response.json()["engines"])
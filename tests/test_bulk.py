@@ -0,0 +1,51 @@
+"""Bulk import writes batches whatever their size."""
+import pytest
+from sqlalchemy import func, select
+
+from factories import add_company
+
+pytestmark = pytest.mark.anyio
+
+
+async def records(robots, images):
+    for index in range(robots):
+        yield index + 1, {
+            "name": f"Robot {index}",
+            "company_slug": "acme",
+            "images": [
+                {"url": f"https://images.example.com/{index}/{position}.jpg", "position": position}
+                for position in range(images)
+            ],
+        }
+
+
+async def test_imports_more_image_parameters_than_one_statement_binds(client, db):
+    from app.db.base import AsyncSessionLocal
+    from app.robots.bulk import import_robots
+    from app.robots.models import RobotImage
+
+    add_company(db, "acme")
+    # 6000 images x 7 columns: past the 32767 bind parameters a statement may carry
+    async with AsyncSessionLocal() as session:
+        report = await import_robots(session, records(10, 600), batch_size=10)
+        count = await session.scalar(select(func.count()).select_from(RobotImage))
+
+    assert report == {"created": 10, "skipped": 0, "failed": 0, "errors": []}
+    assert count == 6000
+
+
+async def test_reimport_skips_existing_skus(client, db):
+    from app.db.base import AsyncSessionLocal
+    from app.robots.bulk import import_robots
+
+    add_company(db, "acme")
+
+    async def with_skus(count):
+        async for line, record in records(count, 1):
+            yield line, dict(record, sku=f"sku-{line}")
+
+    async with AsyncSessionLocal() as session:
+        await import_robots(session, with_skus(2))
+        report = await import_robots(session, with_skus(3))
+
+    assert (report["created"], report["skipped"]) == (1, 2)
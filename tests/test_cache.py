@@ -0,0 +1,131 @@
+"""Commits drop the response cache entries tagged by the rows they change."""
+import os
+import threading
+import time
+
+import pytest
+
+from app.core import cache
+from factories import add_company
+
+
+class BlockingBackend(cache.MemoryCacheBackend):
+    """Stands in for Redis: records the threads it is invalidated on."""
+
+    blocking = True
+
+    def __init__(self):
+        super().__init__(max_entries=100)
+        self.invalidated_on = []
+
+    def invalidate(self, tags):
+        self.invalidated_on.append(threading.current_thread())
+        super().invalidate(tags)
+
+
+@pytest.fixture
+def backend():
+    backend = BlockingBackend()
+    cache.set_backend(backend)
+    yield backend
+    cache.invalidator.wait()
+    cache.set_backend(None)
+
+
+def test_commit_invalidates_blocking_backend_off_the_committing_thread(db, backend):
+    backend.set("/companies/?", b"[]", ["companies"], ttl=60)
+    backend.set("/robots/?", b"[]", ["robots"], ttl=60)
+
+    add_company(db, "acme")
+    cache.invalidator.wait()
+
+    assert backend.get("/companies/?") is None
+    assert backend.get("/robots/?") == b"[]"
+    assert backend.invalidated_on and threading.current_thread() not in backend.invalidated_on
+
+
+def test_rollback_invalidates_nothing(db, backend):
+    from app.company.models import Company, CompanyType
+
+    backend.set("/companies/?", b"[]", ["companies"], ttl=60)
+    db.add(Company(slug="acme", defult_name="Acme", type=CompanyType.MANUFACTURER))
+    db.flush()
+    db.rollback()
+    cache.invalidator.wait()
+
+    assert backend.get("/companies/?") == b"[]"
+
+
+def test_savepoint_rollback_keeps_the_outer_transactions_tags(db, backend):
+    from app.company.models import Company, CompanyType
+
+    backend.set("/companies/?", b"[]", ["companies"], ttl=60)
+    db.add(Company(slug="acme", defult_name="Acme", type=CompanyType.MANUFACTURER))
+    db.flush()
+    savepoint = db.begin_nested()
+    savepoint.rollback()
+    db.commit()
+    cache.invalidator.wait()
+
+    assert backend.get("/companies/?") is None
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """A replica in rotation: the test database itself, standing in for a lagging one."""
+    from app.core.config import settings
+    from app.db.replicas import Replica, replica_router
+
+    replica = Replica(os.environ["DATABASE_URL"])
+    monkeypatch.setattr(replica_router, "replicas", [replica])
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_TTL_SECONDS", 60)
+    yield replica
+
+
+@pytest.mark.anyio
+async def test_replica_reads_refill_the_cache_only_once_the_replica_caught_up(client, db, replica):
+    cache.set_backend(cache.MemoryCacheBackend(max_entries=100, settle_seconds=0.3))
+    try:
+        add_company(db, "acme")  # commits, invalidating company:acme
+
+        # The replica may still return the company as it was before the commit
+        for _ in range(2):
+            response = await client.get("/companies/acme")
+            assert response.status_code == 200 and response.headers["X-Cache"] == "MISS"
+
+        time.sleep(0.3)
+        assert (await client.get("/companies/acme")).headers["X-Cache"] == "MISS"
+        assert (await client.get("/companies/acme")).headers["X-Cache"] == "HIT"
+    finally:
+        cache.set_backend(None)
+        await replica.engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_primary_reads_refill_the_cache_at_once(client, db, replica):
+    from app.db.replicas import READ_PRIMARY_COOKIE
+
+    cache.set_backend(cache.MemoryCacheBackend(max_entries=100, settle_seconds=60))
+    try:
+        add_company(db, "acme")
+        client.cookies.set(READ_PRIMARY_COOKIE, str(time.time() + 60))
+
+        assert (await client.get("/companies/acme")).headers["X-Cache"] == "MISS"
+        assert (await client.get("/companies/acme")).headers["X-Cache"] == "HIT"
+    finally:
+        cache.set_backend(None)
+        await replica.engine.dispose()
+
+
+def test_redis_backend_remembers_invalidations_for_the_settle_time():
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = cache.RedisCacheBackend(fakeredis.FakeRedis(), settle_seconds=0.2)
+
+    backend.set("/companies/acme?", b"{}", ["company:acme"], ttl=60)
+    backend.invalidate(["company:acme"])
+
+    assert backend.get("/companies/acme?") is None
+    assert backend.recently_invalidated(["company:acme", "companies"])
+    assert not backend.recently_invalidated(["companies"])
+    time.sleep(0.25)
+    assert not backend.recently_invalidated(["company:acme"])
@@ -0,0 +1,55 @@
+"""
+Conditional GETs: a client holding the current ETag (or a recent enough
+Last-Modified) gets a 304 after the validators aggregate alone.
+"""
+import pytest
+
+from factories import add_company, add_robot
+
+pytestmark = pytest.mark.anyio
+
+PATHS = ["/companies/?cursor=", "/companies/company-00", "/robots/?count=exact", "/robots/robot-00"]
+
+
+@pytest.fixture
+def catalog(db):
+    for index in range(3):
+        add_company(db, f"company-{index:02}")
+    for index in range(3):
+        add_robot(db, "company-00", f"robot-{index:02}", images=2)
+
+
+@pytest.mark.parametrize("path", PATHS)
+async def test_matching_etag_skips_the_page_query(client, queries, catalog, path):
+    first = await client.get(path)
+    assert first.status_code == 200
+
+    queries.clear()
+    response = await client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert response.content == b""
+    assert len(queries) == 1 and "max(" in queries[0].lower(), queries
+
+
+@pytest.mark.parametrize("path", PATHS)
+async def test_if_modified_since_skips_the_page_query(client, queries, catalog, path):
+    first = await client.get(path)
+
+    queries.clear()
+    response = await client.get(path, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert response.status_code == 304
+    assert len(queries) == 1, queries
+
+
+async def test_change_to_an_embedded_row_refreshes_the_etag(client, db, catalog):
+    from app.robots.models import RobotImage
+
+    first = await client.get("/robots/robot-00")
+    image = db.query(RobotImage).filter_by(robot_slug="robot-00", position=1).one()
+    image.url = "https://images.example.com/robot-00/new.jpg"
+    db.commit()
+
+    response = await client.get("/robots/robot-00", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
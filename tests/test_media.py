@@ -0,0 +1,87 @@
+import io
+import os
+
+import pytest
+
+from app.core.media import MediaUrlBuilder
+from app.media.derivatives import is_stored
+from app.media.storage import LocalStorage
+
+DIGEST = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+
+
+def test_content_addressed_paths_are_versioned_by_name():
+    urls = MediaUrlBuilder("https://cdn.example.com/")
+
+    assert urls.url(f"logos/{DIGEST}.png") == f"https://cdn.example.com/logos/{DIGEST}.png?v=9f86d081884c"
+    # Variants carry their original's digest
+    assert urls.url(f"logos/{DIGEST}_thumb.webp").endswith("_thumb.webp?v=9f86d081884c")
+
+
+def test_other_paths_are_unversioned():
+    urls = MediaUrlBuilder("https://cdn.example.com")
+
+    assert urls.url("logos/acme.png") == "https://cdn.example.com/logos/acme.png"
+    assert urls.url("uploads/3f2b9c1e0d8a4f6b.png") == "https://cdn.example.com/uploads/3f2b9c1e0d8a4f6b.png"
+    assert urls.url("https://example.com/logo.png") == "https://example.com/logo.png"
+
+
+def test_signature_covers_the_version():
+    urls = MediaUrlBuilder("https://cdn.example.com", signing_key="secret")
+    unsigned = MediaUrlBuilder("https://cdn.example.com", signing_key="other")
+
+    url = urls.url(f"logos/{DIGEST}.png")
+    assert "v=9f86d081884c&sig=" in url
+    assert url != unsigned.url(f"logos/{DIGEST}.png")
+
+
+def test_least_recently_used_urls_are_evicted():
+    urls = MediaUrlBuilder("https://cdn.example.com", max_entries=2)
+
+    urls.url("a.png")
+    urls.url("b.png")
+    urls.url("a.png")
+    urls.url("c.png")
+    assert list(urls._urls) == ["a.png", "c.png"]
+
+
+ESCAPES = ["../secret.png", "uploads/../../secret.png", "/etc/passwd", "uploads/./../secret.png", "secret.png"]
+
+
+def test_local_storage_round_trips_upload_paths(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    path = storage.save(io.BytesIO(b"image"), "uploads/logos", ".png", max_bytes=100, chunk_size=4)
+    assert path.startswith("uploads/logos/") and storage.read(path) == b"image"
+    storage.write("uploads/logos/a_thumb.webp", b"thumb")
+    assert storage.exists("uploads/logos/a_thumb.webp")
+
+
+@pytest.mark.parametrize("path", ESCAPES)
+def test_local_storage_stays_inside_the_upload_directories(tmp_path, path):
+    storage = LocalStorage(str(tmp_path / "media"))
+
+    with pytest.raises(ValueError):
+        storage.read(path)
+    with pytest.raises(ValueError):
+        storage.write(path, b"overwritten")
+    with pytest.raises(ValueError):
+        storage.save(io.BytesIO(b"image"), os.path.dirname(path) or ".", ".png", max_bytes=100, chunk_size=4)
+    assert not (tmp_path / "secret.png").exists()
+
+
+def test_local_storage_does_not_follow_symlinks_out(tmp_path):
+    (tmp_path / "media" / "uploads").mkdir(parents=True)
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "media" / "uploads" / "link").symlink_to(tmp_path / "outside")
+    storage = LocalStorage(str(tmp_path / "media"))
+
+    with pytest.raises(ValueError):
+        storage.write("uploads/link/secret.png", b"overwritten")
+    assert not (tmp_path / "outside" / "secret.png").exists()
+
+
+@pytest.mark.parametrize("path", ESCAPES + ["https://example.com/robot.png", "", None])
+def test_only_upload_paths_get_variants(path):
+    assert not is_stored(path)
+    assert is_stored("uploads/robots/robot.png")
@@ -0,0 +1,66 @@
+"""Keyset pagination walks every sort key forward and back through asyncpg."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from factories import add_company, add_robot
+
+pytestmark = pytest.mark.anyio
+
+PRICES = [Decimal("99.50"), None, Decimal("12.00"), Decimal("99.50"), None, Decimal("5.25"), Decimal("1200.00")]
+
+
+@pytest.fixture
+def robots(db):
+    add_company(db, "acme")
+    start = datetime(2024, 1, 1, 12, 30, 15, 250000)
+    robots = {}
+    for index, price in enumerate(PRICES):
+        fields = {
+            "unit_price": price,
+            "payload_kg": Decimal(index % 3) + Decimal("0.125"),
+            "created_at": start + timedelta(hours=index // 2),
+        }
+        add_robot(db, "acme", f"robot-{index}", **fields)
+        robots[f"robot-{index}"] = dict(fields, slug=f"robot-{index}")
+    return robots
+
+
+def expected_order(robots, field, descending):
+    # NULLs sort as the largest value: last ascending, first descending
+    def key(robot):
+        return (robot[field] is None, robot[field] or 0, robot["slug"])
+    return [robot["slug"] for robot in sorted(robots.values(), key=key, reverse=descending)]
+
+
+async def walk(client, sort, cursor="", direction="next_cursor"):
+    slugs = []
+    while cursor is not None:
+        response = await client.get("/robots/", params={"sort": sort, "size": 2, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        page = [item["slug"] for item in body["items"]]
+        slugs = slugs + page if direction == "next_cursor" else page + slugs
+        cursor = body[direction]
+        last = body
+    return slugs, last
+
+
+@pytest.mark.parametrize("sort", ["unit_price", "-unit_price", "payload_kg", "-payload_kg", "created_at", "-created_at"])
+async def test_pages_through_typed_sort_keys(client, robots, sort):
+    expected = expected_order(robots, sort.lstrip("-"), sort.startswith("-"))
+
+    forward, last_page = await walk(client, sort)
+    assert forward == expected
+
+    # And back from the last page
+    backward, _ = await walk(client, sort, last_page["prev_cursor"], "prev_cursor")
+    assert backward + [item["slug"] for item in last_page["items"]] == expected
+
+
+async def test_malformed_cursor_value_is_rejected(client, robots):
+    from app.core.pagination import encode_cursor
+
+    response = await client.get("/robots/", params={"sort": "created_at", "cursor": encode_cursor(["soon", "robot-1"])})
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+"""
+Statements per endpoint. Related rows are loaded per page (selectinload) or
+joined, never per item, so a page costs the same whatever its size: an N+1
+regression fails here.
+"""
+import pytest
+
+from factories import add_company, add_robot
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def catalog(db):
+    for index in range(12):
+        add_company(db, f"company-{index:02}", languages=("en", "de-CH"))
+    for index in range(12):
+        add_robot(db, f"company-{index % 3:02}", f"robot-{index:02}", images=3, category="arm")
+
+
+async def statements(client, queries, url):
+    queries.clear()
+    response = await client.get(url)
+    assert response.status_code == 200, response.text
+    return len(queries)
+
+
+@pytest.mark.parametrize(
+    "path, budget",
+    [
+        # validators aggregate, count, page, translations (selectin)
+        ("/companies/?count=exact", 4),
+        # validators aggregate, page + 1, translations
+        ("/companies/?cursor=", 3),
+        # validators aggregate, count, page (primary image is a column subquery)
+        ("/robots/?count=exact", 3),
+        ("/robots/?cursor=", 2),
+        # count, page, translations
+        ("/companies/search?q=company", 3),
+        # count, page
+        ("/robots/search?q=robot", 2),
+    ],
+)
+async def test_list_queries_do_not_grow_with_page_size(client, queries, catalog, path, budget):
+    small = await statements(client, queries, f"{path}&size=2")
+    large = await statements(client, queries, f"{path}&size=10")
+    assert small == large == budget, queries
+
+
+async def test_company_detail_queries(client, queries, catalog):
+    # validators aggregate, company, translations
+    assert await statements(client, queries, "/companies/company-00") == 3
+
+
+async def test_robot_detail_queries(client, queries, catalog):
+    # validators aggregate, robot with its company (joined), images, company translations (selectin)
+    assert await statements(client, queries, "/robots/robot-00") == 4
+
@@ -0,0 +1,69 @@
+"""
+Robot listings use the filter + sort indexes (Robot.__table_args__): plans
+are checked on a catalog large enough for the planner to prefer them.
+"""
+import pytest
+from sqlalchemy import event, select
+
+from app.core.filtering import apply_filters
+from app.core.loading import loader_options
+from app.core.pagination import sort_clauses
+from app.robots.models import Robot
+from app.robots.routes.public import ROBOT_FILTERS, ROBOT_SORTS
+from app.robots.schemas import RobotFilterParams, RobotListResponse
+from factories import add_catalog, empty_tables
+
+
+@pytest.fixture(scope="module")
+def large_catalog(database):
+    add_catalog(database)
+    yield
+    empty_tables(database)
+
+
+def list_page(sort: str = "name", **filters):
+    """The statement GET /robots/ runs for a page of 10."""
+    stmt = apply_filters(select(Robot), RobotFilterParams(**filters), ROBOT_FILTERS)
+    return stmt.options(*loader_options(RobotListResponse, Robot)).order_by(*sort_clauses(ROBOT_SORTS[sort.lstrip("-")], sort.startswith("-"))).limit(10)
+
+
+def used_indexes(database, stmt) -> set:
+    def explain(connection, cursor, statement, parameters, context, executemany):
+        return f"EXPLAIN (FORMAT JSON) {statement}", parameters
+
+    # Run the statement as compiled (bound parameters and all), EXPLAINed
+    with database.connect() as connection:
+        event.listen(connection, "before_cursor_execute", explain, retval=True)
+        ((plan,),) = connection.execute(stmt).cursor.fetchall()
+
+    indexes = set()
+
+    def walk(node):
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+        for child in node.get("Plans", ()):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return indexes
+
+
+@pytest.mark.parametrize(
+    "stmt, index",
+    [
+        (list_page(), "ix_robots_name_slug"),
+        (list_page(category=["category-3"]), "ix_robots_category_name_slug"),
+        (list_page(robot_type=["type-7"]), "ix_robots_type_name_slug"),
+        (list_page(sort="unit_price", category=["category-3"]), "ix_robots_category_price_slug"),
+        (list_page(sort="-payload_kg", robot_type=["type-7"]), "ix_robots_type_payload_slug"),
+        (list_page(sort="unit_price"), "ix_robots_price_slug"),
+        (list_page(tags=["tag-42"]), "ix_robots_tags_gin"),
+        # primary_image: a lookup per listed robot on the partial index,
+        # and the first image by position for robots without a primary one
+        (list_page(), "ix_robot_images_primary"),
+        (list_page(), "ix_robot_images_slug_position"),
+    ],
+    ids=lambda value: value if isinstance(value, str) else "",
+)
+def test_robot_listing_uses_index(database, large_catalog, stmt, index):
+    assert index in used_indexes(database, stmt)
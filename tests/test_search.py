@@ -0,0 +1,169 @@
+"""Typesense sync and search endpoints, against the in-process stand-in."""
+from datetime import datetime
+
+import pytest
+
+from app.company.models import Company, CompanyTranslation, CompanyType, LanguageEnum
+from app.robots.models import Robot
+from app.search import backend as search
+from app.search.reindex import SOURCES, reindex
+from app.search.sync import indexer
+from factories import add_company, add_robot
+from typesense_standin import FakeDocuments, FakeTypesense
+
+
+@pytest.fixture
+def typesense():
+    client = FakeTypesense()
+    search.set_client(client)
+    search.ensure_collections(client)
+    yield client
+    indexer.wait()
+    search.set_client(None)
+
+
+def test_committed_changes_are_indexed_in_one_batch(db, typesense):
+    add_company(db, "acme")
+    db.add_all([Robot(slug=f"arm-{index}", company_slug="acme", name=f"Arm {index}") for index in range(3)])
+    db.commit()
+    indexer.wait()
+
+    robots = typesense.collections[search.ROBOTS_COLLECTION].documents
+    assert set(typesense.documents(search.ROBOTS_COLLECTION)) == {"arm-0", "arm-1", "arm-2"}
+    assert [len(batch) for batch in robots.imports] == [3]
+
+
+def test_updates_and_deletes_are_synced(db, typesense):
+    add_company(db, "acme")
+    robot = add_robot(db, "acme", "arm", name="Arm")
+    robot.name = "Heavy arm"
+    db.commit()
+    indexer.wait()
+    assert typesense.documents(search.ROBOTS_COLLECTION)["arm"]["name"] == "Heavy arm"
+
+    db.delete(robot)
+    db.commit()
+    indexer.wait()
+    assert "arm" not in typesense.documents(search.ROBOTS_COLLECTION)
+
+
+def test_rolled_back_changes_are_not_indexed(db, typesense):
+    add_company(db, "acme")
+    db.add(Robot(slug="arm", company_slug="acme", name="Arm"))
+    db.flush()
+    db.rollback()
+    indexer.wait()
+    assert typesense.documents(search.ROBOTS_COLLECTION) == {}
+
+
+@pytest.mark.anyio
+async def test_robot_search_keeps_engine_ranking(client, db, typesense):
+    add_company(db, "acme")
+    add_robot(db, "acme", "welder", name="Welding cell", category="gripper")
+    add_robot(db, "acme", "gripper", name="Gripper pro")
+    add_robot(db, "acme", "mover", name="Mover")
+    indexer.wait()
+
+    response = await client.get("/robots/search?q=grip")
+    assert response.status_code == 200
+    body = response.json()
+    # Name matches outrank category matches
+    assert [item["slug"] for item in body["items"]] == ["gripper", "welder"]
+    assert body["total"] == 2
+
+
+@pytest.mark.anyio
+async def test_company_search_is_grouped_and_filtered_by_language(client, db, typesense):
+    company = Company(slug="zurich-robotics", defult_name="Zurich Robotics", type=CompanyType.INTEGRATOR)
+    company.translations = [
+        CompanyTranslation(language=LanguageEnum.EN, name="Zurich Robotics", city="Zurich"),
+        CompanyTranslation(language=LanguageEnum.DE_CH, name="Zürich Robotik", city="Zurich"),
+    ]
+    db.add(company)
+    db.commit()
+    add_company(db, "geneva-automation", languages=("fr-CH",), name="Geneva Automation")
+    indexer.wait()
+
+    body = (await client.get("/companies/search?q=zurich")).json()
+    assert [item["slug"] for item in body["items"]] == ["zurich-robotics"]
+
+    body = (await client.get("/companies/search?q=robotik&lang=de-CH")).json()
+    assert [(item["slug"], item["name"]) for item in body["items"]] == [("zurich-robotics", "Zürich Robotik")]
+    assert (await client.get("/companies/search?q=robotik&lang=fr-CH")).json()["items"] == []
+
+
+def test_reindex_rebuilds_collection(db, typesense):
+    add_company(db, "acme")
+    for index in range(5):
+        add_robot(db, "acme", f"arm-{index}", updated_at=datetime(2024, 1, 1))
+    indexer.wait()
+    typesense.documents(search.ROBOTS_COLLECTION).clear()
+
+    assert reindex(*SOURCES["robots"], batch_size=2) == 5
+    assert len(typesense.documents(search.ROBOTS_COLLECTION)) == 5
+    assert [len(batch) for batch in typesense.collections[search.ROBOTS_COLLECTION].documents.imports] == [2, 2, 1]
+
+
+def test_search_keeps_answering_during_a_reindex(db, typesense):
+    add_company(db, "acme")
+    for index in range(4):
+        add_robot(db, "acme", f"arm-{index}", name=f"Arm {index}", updated_at=datetime(2024, 1, 1))
+    indexer.wait()
+    live = typesense.aliases_by_name[search.ROBOTS_COLLECTION]
+    during = []
+    original_import = FakeDocuments.import_
+
+    def import_(self, documents, params=None):
+        # Searched mid-build: the current version answers in full
+        during.append(search.search_robots("arm", 1, 10))
+        if len(during) == 1:
+            # Committed during the build: a new robot, a renamed one, a deleted one
+            add_robot(db, "acme", "gripper", name="Arm gripper")
+            db.get(Robot, "arm-0").name = "Arm zero"
+            db.delete(db.get(Robot, "arm-1"))
+            db.commit()
+            indexer.wait()
+        return original_import(self, documents, params)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(FakeDocuments, "import_", import_)
+        assert reindex(*SOURCES["robots"], batch_size=2) == 4
+
+    assert during[0] == (4, ["arm-0", "arm-1", "arm-2", "arm-3"])
+    # The alias moved to a new version; the old one is gone
+    assert typesense.aliases_by_name[search.ROBOTS_COLLECTION] != live
+    assert live not in typesense.collections_by_name
+    documents = typesense.documents(search.ROBOTS_COLLECTION)
+    assert sorted(documents) == ["arm-0", "arm-2", "arm-3", "gripper"]
+    assert documents["arm-0"]["name"] == "Arm zero"
+
+
+def test_savepoint_rollback_keeps_the_outer_transactions_changes(db, typesense):
+    add_company(db, "acme")
+    db.add(Robot(slug="arm", company_slug="acme", name="Arm"))
+    db.flush()
+    with db.begin_nested() as savepoint:
+        db.add(Robot(slug="gripper", company_slug="acme", name="Gripper"))
+        db.flush()
+        savepoint.rollback()
+    db.commit()
+    indexer.wait()
+
+    assert "arm" in typesense.documents(search.ROBOTS_COLLECTION)
+
+
+def test_reindex_moves_an_unaliased_collection_behind_an_alias(db):
+    client = FakeTypesense()
+    client.collections.create(search.ROBOTS_SCHEMA)  # created before collections were aliased
+    search.set_client(client)
+    try:
+        add_company(db, "acme")
+        add_robot(db, "acme", "arm")
+        indexer.wait()
+        assert reindex(*SOURCES["robots"]) == 1
+    finally:
+        search.set_client(None)
+
+    version = client.aliases_by_name[search.ROBOTS_COLLECTION]
+    assert list(client.collections_by_name) == [version]
+    assert list(client.documents(search.ROBOTS_COLLECTION)) == ["arm"]
@@ -0,0 +1,117 @@
+"""S3Storage against moto's in-process S3; skipped when moto isn't installed."""
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException
+
+from app.media.storage import S3Storage
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+BUCKET = "media"
+MiB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def storage(s3):
+    # S3's smallest multipart part: files over it go up in parts
+    return S3Storage(s3, BUCKET, multipart_threshold=5 * MiB, multipart_chunk_size=5 * MiB)
+
+
+def save(storage, data, source=io.BytesIO):
+    return storage.save(source(data), "uploads/logos", ".png", max_bytes=16 * MiB, chunk_size=64 * 1024,
+                        content_type="image/png")
+
+
+def test_save_keys_objects_by_content_hash(storage, s3):
+    path = save(storage, b"logo")
+
+    assert path == f"uploads/logos/{hashlib.sha256(b'logo').hexdigest()}.png"
+    stored = s3.get_object(Bucket=BUCKET, Key=path)
+    assert stored["Body"].read() == b"logo" and stored["ContentType"] == "image/png"
+
+
+def test_save_uploads_large_files_in_parts(storage, s3):
+    data = bytes(range(256)) * (6 * MiB // 256)
+
+    path = save(storage, data)
+
+    assert storage.read(path) == data
+    assert s3.head_object(Bucket=BUCKET, Key=path, PartNumber=1)["PartsCount"] == 2
+
+
+def test_save_spools_unseekable_sources(storage):
+    class Stream(io.RawIOBase):
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def read(self, size=-1):
+            return self._data.read(size)
+
+    assert storage.read(save(storage, b"streamed", Stream)) == b"streamed"
+
+
+def test_identical_content_is_stored_once(storage, s3, monkeypatch):
+    first = save(storage, b"logo")
+    uploads = []
+    monkeypatch.setattr(s3, "upload_fileobj", lambda *args, **kwargs: uploads.append(args))
+
+    assert save(storage, b"logo") == first
+    assert uploads == []
+
+
+def test_size_limit_is_enforced_before_upload(storage, s3):
+    with pytest.raises(HTTPException) as error:
+        storage.save(io.BytesIO(b"x" * 101), "uploads/logos", ".png", max_bytes=100, chunk_size=10)
+
+    assert error.value.status_code == 413
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+
+def test_read_write_and_exists(storage, s3):
+    assert not storage.exists("uploads/logos/a_thumb.webp")
+
+    storage.write("uploads/logos/a_thumb.webp", b"thumb", "image/webp")
+
+    assert storage.exists("uploads/logos/a_thumb.webp")
+    assert storage.read("uploads/logos/a_thumb.webp") == b"thumb"
+    assert s3.head_object(Bucket=BUCKET, Key="uploads/logos/a_thumb.webp")["ContentType"] == "image/webp"
+
+
+def test_paths_outside_the_upload_directories_are_rejected(storage):
+    for call in (
+        lambda: storage.read("../secret.png"),
+        lambda: storage.write("other/secret.png", b"x"),
+        lambda: storage.exists("uploads/../secret.png"),
+        lambda: storage.presign_upload("..", ".png", "image/png", 100, 60),
+    ):
+        with pytest.raises(ValueError):
+            call()
+
+
+def test_presigned_upload_accepts_the_file_within_its_conditions(storage, s3):
+    # moto intercepts requests (not httpx) calls to the presigned URL
+    requests = pytest.importorskip("requests")
+
+    post = storage.presign_upload("uploads/logos", ".png", "image/png", max_bytes=100, expires=60)
+
+    assert post["path"].startswith("uploads/logos/") and post["path"].endswith(".png")
+    assert post["fields"]["key"] == post["path"] and post["expires_in"] == 60
+    response = requests.post(post["url"], data=post["fields"], files={"file": ("logo.png", b"logo")})
+    assert response.status_code in (200, 204), response.text
+    assert storage.read(post["path"]) == b"logo"
@@ -0,0 +1,88 @@
+"""Upload routes refuse bodies over MEDIA_MAX_UPLOAD_BYTES before they are spooled."""
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.media import storage
+from factories import add_company
+
+pytestmark = pytest.mark.anyio
+
+LIMIT = 1024
+URL = "/companies/acme/upload-logo"
+
+
+@pytest.fixture
+def headers(db):
+    from app.auth.models import User
+    from app.auth.utils import access_token_claims, create_access_token
+
+    user = User(id=str(uuid.uuid4()), email="ada@example.com", username="ada", hashed_password="-")
+    db.add(user)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token(access_token_claims(user))}"}
+
+
+@pytest.fixture
+def media(tmp_path, monkeypatch, db):
+    add_company(db, "acme")
+    monkeypatch.setattr(settings, "MEDIA_MAX_UPLOAD_BYTES", LIMIT)
+    storage.set_storage(storage.LocalStorage(str(tmp_path)))
+    yield tmp_path
+    storage.set_storage(None)
+
+
+def stored(media):
+    return [path for path in media.rglob("*") if path.is_file()]
+
+
+def multipart(size):
+    boundary = "limit-test"
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="logo.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode()
+    return head + b"x" * size + f"\r\n--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+async def test_upload_within_the_limit_is_stored(client, headers, media):
+    response = await client.put(URL, headers=headers, files={"file": ("logo.png", b"x" * LIMIT, "image/png")})
+
+    assert response.status_code == 200, response.text
+    assert len(stored(media)) == 1
+
+
+async def test_declared_oversized_body_is_refused_unread(client, headers, media, monkeypatch):
+    # Past the multipart allowance too, so the route class refuses it on its Content-Length
+    body, content_type = multipart(LIMIT + storage._MULTIPART_OVERHEAD_BYTES)
+    monkeypatch.setattr("starlette.requests.Request.form", lambda *args, **kwargs: pytest.fail("body parsed"))
+
+    response = await client.put(URL, headers={**headers, "Content-Type": content_type}, content=body)
+
+    assert response.status_code == 413
+    assert stored(media) == []
+
+
+async def test_chunked_oversized_body_is_cut_off(client, headers, media):
+    body, content_type = multipart(4 * (LIMIT + storage._MULTIPART_OVERHEAD_BYTES))
+    sent = []
+
+    async def chunks():
+        for start in range(0, len(body), 4096):
+            sent.append(start)
+            yield body[start:start + 4096]
+
+    response = await client.put(URL, headers={**headers, "Content-Type": content_type}, content=chunks())
+
+    assert response.status_code == 413
+    assert len(sent) < len(range(0, len(body), 4096))
+    assert stored(media) == []
+
+
+async def test_file_over_the_limit_within_the_allowance_is_refused_while_stored(client, headers, media):
+    response = await client.put(URL, headers=headers, files={"file": ("logo.png", b"x" * (LIMIT + 1), "image/png")})
+
+    assert response.status_code == 413
+    assert stored(media) == []
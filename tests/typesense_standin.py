@@ -0,0 +1,162 @@
+"""
+In-process stand-in for the parts of the Typesense client the app uses.
+
+Swap it in with app.search.backend.set_client(FakeTypesense()). Collection
+names resolve through aliases first, as in Typesense. Matching is simple: every query token must prefix-match a word of one of the `query_by`
+fields; hits rank by how early the first matching field comes in `query_by`.
+"""
+import re
+from typing import Dict, List
+
+from typesense.exceptions import ObjectNotFound
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(value) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    return [word for item in values if item is not None for word in _WORD.findall(str(item).lower())]
+
+
+def _matches_filter(document: dict, filter_by: str) -> bool:
+    """`field:value`, `field:=`value`` and `id:[`a`,`b`]` clauses joined by &&."""
+    for clause in filter(None, (part.strip() for part in filter_by.split("&&"))):
+        field, _, expected = clause.partition(":")
+        expected = expected.lstrip("=").strip()
+        if expected.startswith("["):
+            allowed = {value.strip().strip("`") for value in expected[1:-1].split(",")}
+        else:
+            allowed = {expected.strip("`")}
+        actual = document.get(field)
+        if isinstance(actual, bool):
+            actual = str(actual).lower()
+        if str(actual) not in allowed:
+            return False
+    return True
+
+
+class FakeDocuments:
+    def __init__(self, collection: "FakeCollection"):
+        self.collection = collection
+        self.imports: List[List[dict]] = []
+
+    def import_(self, documents: List[dict], params: dict = None) -> List[dict]:
+        self.imports.append(list(documents))
+        for document in documents:
+            self.collection.documents_by_id[document["id"]] = dict(document)
+        return [{"success": True} for _ in documents]
+
+    def delete(self, params: dict) -> dict:
+        doomed = [
+            document_id for document_id, document in self.collection.documents_by_id.items()
+            if _matches_filter(document, params["filter_by"])
+        ]
+        for document_id in doomed:
+            del self.collection.documents_by_id[document_id]
+        return {"num_deleted": len(doomed)}
+
+    def search(self, params: dict) -> dict:
+        fields = params["query_by"].split(",")
+        tokens = [] if params["q"] == "*" else _words(params["q"])
+        hits = []
+        for document in self.collection.documents_by_id.values():
+            if params.get("filter_by") and not _matches_filter(document, params["filter_by"]):
+                continue
+            field_words = [_words(document.get(field)) for field in fields]
+            matched = [
+                position for position, words in enumerate(field_words)
+                if any(word.startswith(token) for token in tokens for word in words)
+            ]
+            everything = [word for words in field_words for word in words]
+            if all(any(word.startswith(token) for word in everything) for token in tokens):
+                hits.append((min(matched, default=0), document))
+        hits.sort(key=lambda hit: hit[0])
+
+        page, per_page = params.get("page", 1), params.get("per_page", 10)
+        start = (page - 1) * per_page
+        if "group_by" in params:
+            groups: Dict[str, List[dict]] = {}
+            for _, document in hits:
+                groups.setdefault(document[params["group_by"]], []).append(document)
+            keys = list(groups)
+            return {
+                "found": len(keys),
+                "grouped_hits": [
+                    {"group_key": [key], "hits": [{"document": document} for document in groups[key][:params.get("group_limit", 3)]]}
+                    for key in keys[start:start + per_page]
+                ],
+            }
+        return {"found": len(hits), "hits": [{"document": document} for _, document in hits[start:start + per_page]]}
+
+
+class FakeCollection:
+    def __init__(self, client: "FakeTypesense", name: str):
+        self.client = client
+        self.name = name
+        self.documents_by_id: Dict[str, dict] = {}
+        self.documents = FakeDocuments(self)
+
+    def retrieve(self) -> dict:
+        return self.client.schemas[self.name]
+
+    def delete(self) -> dict:
+        del self.client.collections_by_name[self.name]
+        return self.client.schemas.pop(self.name)
+
+
+class FakeCollections:
+    def __init__(self, client: "FakeTypesense"):
+        self.client = client
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        try:
+            return self.client.collections_by_name[self.client.aliases_by_name.get(name, name)]
+        except KeyError:
+            raise ObjectNotFound(404, f"Not found: {name}") from None
+
+    def create(self, schema: dict) -> dict:
+        self.client.schemas[schema["name"]] = schema
+        self.client.collections_by_name[schema["name"]] = FakeCollection(self.client, schema["name"])
+        return schema
+
+
+class FakeAlias:
+    def __init__(self, client: "FakeTypesense", name: str):
+        self.client = client
+        self.name = name
+
+    def retrieve(self) -> dict:
+        try:
+            return {"name": self.name, "collection_name": self.client.aliases_by_name[self.name]}
+        except KeyError:
+            raise ObjectNotFound(404, f"Not found: {self.name}") from None
+
+    def delete(self) -> dict:
+        alias = self.retrieve()
+        del self.client.aliases_by_name[self.name]
+        return alias
+
+
+class FakeAliases:
+    def __init__(self, client: "FakeTypesense"):
+        self.client = client
+
+    def __getitem__(self, name: str) -> FakeAlias:
+        return FakeAlias(self.client, name)
+
+    def upsert(self, name: str, mapping: dict) -> dict:
+        self.client.aliases_by_name[name] = mapping["collection_name"]
+        return {"name": name, **mapping}
+
+
+class FakeTypesense:
+    def __init__(self):
+        self.schemas: Dict[str, dict] = {}
+        self.collections_by_name: Dict[str, FakeCollection] = {}
+        self.aliases_by_name: Dict[str, str] = {}
+        self.collections = FakeCollections(self)
+        self.aliases = FakeAliases(self)
+
+    def documents(self, name: str) -> Dict[str, dict]:
+        """Indexed documents of a collection (or alias), by id."""
+        return self.collections[name].documents_by_id